@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+import hashlib
+import uuid
+
+from sqlalchemy import text
+
+from pkg.db import engine
+
+BENCHMARK_BOOKS = 200_000
+BENCHMARK_AUTHORS = 5_000
+BENCHMARK_COLUMNS = ("authors", "categories", "genres")
+
+
+def seed_uid(value: int) -> str:
+    return str(uuid.UUID(hashlib.md5(str(value).encode("utf-8")).hexdigest()))
+
+
+def get_list_query(column: str, uid: str) -> str:
+    # The same shape as the by-author/category/genre list routes: uuid[]
+    # containment, keyset order, one page.
+    return (
+        f"SELECT * FROM bench_books WHERE {column} @> ARRAY['{uid}']::uuid[] "
+        f"ORDER BY created_at, uid LIMIT 10"
+    )
+
+
+async def explain(connection, query: str) -> str:
+    result = await connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"))
+    return "\n".join(row[0] for row in result.all())
+
+
+async def run_benchmark(books: int, authors: int):
+    try:
+        await explain_benchmark(books, authors)
+    finally:
+        await engine.dispose()
+
+
+async def explain_benchmark(books: int, authors: int):
+    async with engine.connect() as connection:
+        # Everything runs in one transaction on a temporary table, so the real
+        # books table is never touched and nothing is left behind.
+        await connection.execute(
+            text(
+                "CREATE TEMP TABLE bench_books ("
+                "uid uuid PRIMARY KEY, title varchar NOT NULL, "
+                "created_at timestamp NOT NULL, authors uuid[] NOT NULL, "
+                "categories uuid[] NOT NULL, genres uuid[] NOT NULL"
+                ") ON COMMIT DROP"
+            )
+        )
+        await connection.execute(
+            text(
+                "INSERT INTO bench_books "
+                "SELECT gen_random_uuid(), 'Book ' || i, "
+                "timestamp '2020-01-01' + i * interval '1 second', "
+                "ARRAY[md5((i % CAST(:authors AS integer))::text)::uuid, "
+                "md5(((i * 7) % CAST(:authors AS integer))::text)::uuid], "
+                "ARRAY[md5((i % 50)::text)::uuid], "
+                "ARRAY[md5((i % 200)::text)::uuid] "
+                "FROM generate_series(1, CAST(:books AS integer)) AS i"
+            ),
+            {"books": books, "authors": authors},
+        )
+        await connection.execute(text("ANALYZE bench_books"))
+
+        queries = {
+            "authors": get_list_query("authors", seed_uid(authors // 2)),
+            "categories": get_list_query("categories", seed_uid(7)),
+            "genres": get_list_query("genres", seed_uid(7)),
+        }
+
+        print(f"Seeded {books} books over {authors} authors.\n")
+        for column, query in queries.items():
+            print(f"== {column}, before (no GIN index) ==")
+            print(await explain(connection, query), "\n")
+
+        for column in BENCHMARK_COLUMNS:
+            await connection.execute(
+                text(f"CREATE INDEX ON bench_books USING gin ({column})")
+            )
+        await connection.execute(text("ANALYZE bench_books"))
+
+        for column, query in queries.items():
+            print(f"== {column}, after (GIN index) ==")
+            print(await explain(connection, query), "\n")
+
+        await connection.rollback()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Show the plan change from GIN indexes on book uid arrays."
+    )
+    parser.add_argument("--books", type=int, default=BENCHMARK_BOOKS)
+    parser.add_argument("--authors", type=int, default=BENCHMARK_AUTHORS)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.books, args.authors))
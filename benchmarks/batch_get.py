@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+BENCHMARK_TYPES = {"book": "books", "author": "authors"}
+BENCHMARK_SIZES = (20, 200)
+BENCHMARK_ROUNDS = 5
+
+
+async def sample_uids(client: httpx.AsyncClient, change_type: str, count: int):
+    uids, cursor = [], None
+    while len(uids) < count:
+        params = {"types": change_type, "limit": min(count - len(uids), 1000)}
+        if cursor:
+            params["cursor"] = cursor
+
+        response = await client.get("/changes", params=params)
+        response.raise_for_status()
+        data = response.json()
+        uids.extend(change["uid"] for change in data["changes"])
+
+        if not data["has_more"]:
+            break
+        cursor = data["next_cursor"]
+
+    return uids
+
+
+async def timed(coroutine) -> float:
+    started = time.perf_counter()
+    await coroutine
+    return (time.perf_counter() - started) * 1000
+
+
+async def get_sequential(client: httpx.AsyncClient, path: str, uids: list):
+    for uid in uids:
+        response = await client.get(f"/{path}/get/uid/{uid}")
+        response.raise_for_status()
+
+
+async def get_concurrent(client: httpx.AsyncClient, path: str, uids: list):
+    responses = await asyncio.gather(
+        *(client.get(f"/{path}/get/uid/{uid}") for uid in uids)
+    )
+    for response in responses:
+        response.raise_for_status()
+
+
+async def get_batch(client: httpx.AsyncClient, path: str, uids: list):
+    response = await client.post(f"/{path}/get/batch", json={"uids": uids})
+    response.raise_for_status()
+
+
+async def run_benchmark(base_url: str, sizes: list[int], rounds: int):
+    modes = {
+        "sequential /get/uid": get_sequential,
+        "concurrent /get/uid": get_concurrent,
+        "one /get/batch": get_batch,
+    }
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        for change_type, path in BENCHMARK_TYPES.items():
+            # /get/uid responses are cached, so every round and mode gets its
+            # own uids whenever the catalog is large enough.
+            needed = max(sizes) * rounds * len(modes)
+            uids = await sample_uids(client, change_type, needed)
+            if len(uids) < max(sizes):
+                print(f"{path}: only {len(uids)} rows, skipping")
+                continue
+            if len(uids) < needed:
+                print(f"{path}: only {len(uids)} rows, some uids are reused")
+
+            offset = 0
+            for size in sizes:
+                for mode, get in modes.items():
+                    timings = []
+                    for _ in range(rounds):
+                        if offset + size > len(uids):
+                            offset = 0
+                        sample = uids[offset : offset + size]
+                        offset += size
+                        timings.append(await timed(get(client, path, sample)))
+
+                    print(
+                        f"{path:<8} {size:>4} uids  {mode:<20} "
+                        f"median {statistics.median(timings):8.1f} ms  "
+                        f"best {min(timings):8.1f} ms"
+                    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare N /get/uid requests with one /get/batch request."
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BENCHMARK_SIZES)
+    parser.add_argument("--rounds", type=int, default=BENCHMARK_ROUNDS)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.base_url, args.sizes, args.rounds))
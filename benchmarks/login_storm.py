@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+BENCHMARK_CONCURRENCY = 32
+BENCHMARK_DURATION = 10.0
+BENCHMARK_PROBE_PATH = "/books/category/list"
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+async def probe(
+    client: httpx.AsyncClient, path: str, stop: asyncio.Event
+) -> list[float]:
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    return latencies
+
+
+async def login(
+    client: httpx.AsyncClient, credentials: dict, stop: asyncio.Event
+) -> int:
+    logins = 0
+    while not stop.is_set():
+        response = await client.post("/auth/login", json=credentials)
+        response.raise_for_status()
+        logins += 1
+
+    return logins
+
+
+async def run_phase(
+    client: httpx.AsyncClient,
+    path: str,
+    credentials: dict,
+    concurrency: int,
+    duration: float,
+) -> tuple[list[float], int]:
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, path, stop))
+    login_tasks = [
+        asyncio.create_task(login(client, credentials, stop))
+        for _ in range(concurrency)
+    ]
+
+    await asyncio.sleep(duration)
+    stop.set()
+
+    return await probe_task, sum(await asyncio.gather(*login_tasks))
+
+
+def report(phase: str, latencies: list[float], logins: int, duration: float):
+    print(
+        f"{phase:<7} {len(latencies):>6} GETs  "
+        f"p50 {statistics.median(latencies):7.1f} ms  "
+        f"p99 {percentile(latencies, 0.99):7.1f} ms  "
+        f"max {max(latencies):7.1f} ms  "
+        f"{logins / duration:6.1f} logins/s"
+    )
+
+
+async def run_benchmark(
+    base_url: str,
+    path: str,
+    credentials: dict,
+    concurrency: int,
+    duration: float,
+):
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=60, limits=limits
+    ) as client:
+        # A single login first, so bad credentials fail before the storm.
+        response = await client.post("/auth/login", json=credentials)
+        response.raise_for_status()
+
+        for phase, phase_concurrency in (("idle", 0), ("storm", concurrency)):
+            latencies, logins = await run_phase(
+                client, path, credentials, phase_concurrency, duration
+            )
+            report(phase, latencies, logins, duration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure unrelated GET latency while a login storm runs. Point it at "
+            "a single API worker, so the logins share its event loop."
+        )
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--path", default=BENCHMARK_PROBE_PATH)
+    parser.add_argument("--concurrency", type=int, default=BENCHMARK_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=BENCHMARK_DURATION)
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_benchmark(
+            args.base_url,
+            args.path,
+            {"email": args.email, "password": args.password},
+            args.concurrency,
+            args.duration,
+        )
+    )
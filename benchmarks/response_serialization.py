@@ -0,0 +1,112 @@
+import argparse
+import json
+import timeit
+import uuid
+import warnings
+from datetime import date, datetime
+
+from fastapi.responses import JSONResponse as LegacyJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from pkg.responses import JSONResponse
+from src.books.models import Book
+from src.books.schemas import BookResponseSchema
+
+BENCHMARK_BOOKS = 10
+BENCHMARK_NUMBER = 5000
+BENCHMARK_REPEAT = 5
+
+book_list_adapter = TypeAdapter(list[BookResponseSchema])
+
+
+class LegacyBookResponseSchema(BaseModel):
+    uid: str
+    title: str
+    description: str
+    isbn: str
+    published_date: str
+    page_count: int
+    authors: list[str]
+    categories: list[str]
+    genres: list[str]
+    images: list[str]
+    image_variants: dict = {}
+
+
+def make_books(count: int) -> list[Book]:
+    now = datetime.now()
+    return [
+        Book(
+            uid=uuid.uuid4(),
+            title=f"Dune {index}",
+            description="A science fiction novel about the desert planet Arrakis.",
+            isbn=str(9780441172719 + index),
+            published_date=date(1965, 6, 1),
+            page_count=604,
+            authors=[uuid.uuid4()],
+            categories=[uuid.uuid4(), uuid.uuid4()],
+            genres=[uuid.uuid4()],
+            images=[f"http://localhost:8080/bookly/images/{index}.jpg"],
+            image_variants={},
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+
+
+def render_legacy(books: list[Book]) -> bytes:
+    # What the list routes did before: dump to JSON, parse it back, validate it
+    # again and let the stdlib encoder serialize it a third time.
+    return LegacyJSONResponse(
+        content={
+            "message": "List of books",
+            "books": [
+                LegacyBookResponseSchema(
+                    **json.loads(book.model_dump_json())
+                ).model_dump()
+                for book in books
+            ],
+        }
+    ).body
+
+
+def render(books: list[Book]) -> bytes:
+    return JSONResponse(
+        content={
+            "message": "List of books",
+            "books": book_list_adapter.validate_python(books),
+        }
+    ).body
+
+
+def run_benchmark(count: int, number: int, repeat: int):
+    # Book.published_date is annotated as datetime but loaded as a date, so
+    # the legacy model_dump_json call warns on every row.
+    warnings.filterwarnings("ignore", message="Pydantic serializer warnings")
+    books = make_books(count)
+
+    legacy_body, body = render_legacy(books), render(books)
+    print(f"Bodies equal: {legacy_body == body}")
+    if json.loads(legacy_body) != json.loads(body):
+        raise SystemExit("The two paths render different content")
+
+    timings = {}
+    for name, renderer in (("legacy", render_legacy), ("single pass", render)):
+        best = min(timeit.repeat(lambda: renderer(books), number=number, repeat=repeat))
+        timings[name] = best / number * 1_000_000
+        print(f"{name:<12} {timings[name]:8.1f} us per {count}-book page")
+
+    print(f"saved        {timings['legacy'] - timings['single pass']:8.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the legacy and single-pass list page serialization."
+    )
+    parser.add_argument("--books", type=int, default=BENCHMARK_BOOKS)
+    parser.add_argument("--number", type=int, default=BENCHMARK_NUMBER)
+    parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT)
+    args = parser.parse_args()
+
+    run_benchmark(args.books, args.number, args.repeat)
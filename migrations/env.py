@@ -6,9 +6,10 @@ from sqlmodel import SQLModel
 
 from pkg.config import Config
 from src.auth.models import PasswordResetLog, TokenBlacklist, User
-from src.authors.models import Author
-from src.books.models import Book, BookCategory, BookGenre
+from src.authors.models import Author, AuthorNationalityCount
+from src.books.models import Book, BookCategory, BookFacetCount, BookGenre, BookImport
 from src.profile.models import UserProfile
+from src.uploads.models import StoredImage, UploadJob
 
 config = context.config
 
@@ -22,6 +23,17 @@ config.set_main_option(
 
 target_metadata = SQLModel.metadata
 
+UNMAPPED_COLUMNS = {("books", "search_vector")}
+UNMAPPED_INDEXES = {"ix_books_search_vector", "ix_authors_full_name_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "column" and (object.table.name, name) in UNMAPPED_COLUMNS:
+        return False
+    if type_ == "index" and name in UNMAPPED_INDEXES:
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -30,6 +42,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -44,7 +57,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
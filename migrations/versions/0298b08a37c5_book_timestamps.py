@@ -0,0 +1,50 @@
+"""book_timestamps
+
+Revision ID: 0298b08a37c5
+Revises: 4ff76acb2c67
+Create Date: 2024-10-14 10:12:41.503218
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0298b08a37c5"
+down_revision: Union[str, None] = "4ff76acb2c67"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "books",
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "books",
+        sa.Column(
+            "updated_at",
+            postgresql.TIMESTAMP(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.alter_column("books", "created_at", server_default=None)
+    op.alter_column("books", "updated_at", server_default=None)
+    op.create_index(
+        "ix_books_created_at_uid", "books", ["created_at", "uid"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_books_created_at_uid", table_name="books")
+    op.drop_column("books", "updated_at")
+    op.drop_column("books", "created_at")
@@ -0,0 +1,142 @@
+"""facet_counts
+
+Revision ID: 0b7e3c9d41a8
+Revises: f4a1d9b6e027
+Create Date: 2024-10-18 10:27:51.306418
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0b7e3c9d41a8"
+down_revision: Union[str, None] = "f4a1d9b6e027"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Counts are kept by statement-level triggers reading the transition tables,
+# so a bulk INSERT ... SELECT applies one grouped upsert per statement. Rows
+# are upserted in key order so concurrent writers lock them in the same order.
+BOOK_FACET_COUNT_DELTAS = """
+    INSERT INTO book_facet_counts AS counts (facet, uid, count)
+    SELECT changes.facet, changes.uid, sum(changes.delta)
+    FROM ({changes}) AS changes
+    GROUP BY changes.facet, changes.uid
+    HAVING sum(changes.delta) <> 0
+    ORDER BY changes.facet, changes.uid
+    ON CONFLICT (facet, uid) DO UPDATE SET count = counts.count + EXCLUDED.count
+"""
+BOOK_FACET_ROWS = """
+    SELECT facets.facet, facets.uid, {delta} AS delta
+    FROM {table}, book_facets({table}.authors, {table}.categories, {table}.genres)
+        AS facets
+"""
+
+AUTHOR_NATIONALITY_COUNT_DELTAS = """
+    INSERT INTO author_nationality_counts AS counts (nationality, count)
+    SELECT changes.nationality, sum(changes.delta)
+    FROM ({changes}) AS changes
+    GROUP BY changes.nationality
+    HAVING sum(changes.delta) <> 0
+    ORDER BY changes.nationality
+    ON CONFLICT (nationality) DO UPDATE SET count = counts.count + EXCLUDED.count
+"""
+AUTHOR_NATIONALITY_ROWS = "SELECT nationality, {delta} AS delta FROM {table}"
+
+TRIGGER_CHANGES = {
+    "insert": (("NEW", 1),),
+    "update": (("NEW", 1), ("OLD", -1)),
+    "delete": (("OLD", -1),),
+}
+
+
+def create_count_triggers(table: str, counts: str, deltas: str, rows: str) -> None:
+    for event, sources in TRIGGER_CHANGES.items():
+        changes = " UNION ALL ".join(
+            rows.format(table=f"{source.lower()}_rows", delta=delta)
+            for source, delta in sources
+        )
+        transition_tables = " ".join(
+            f"{source} TABLE AS {source.lower()}_rows" for source, _ in sources
+        )
+        op.execute(f"""
+            CREATE FUNCTION {counts}_{event}() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                {deltas.format(changes=changes)};
+                RETURN NULL;
+            END
+            $$
+            """)
+        op.execute(f"""
+            CREATE TRIGGER {counts}_{event}
+            AFTER {event.upper()} ON {table}
+            REFERENCING {transition_tables}
+            FOR EACH STATEMENT EXECUTE FUNCTION {counts}_{event}()
+            """)
+
+
+def drop_count_triggers(table: str, counts: str) -> None:
+    for event in TRIGGER_CHANGES:
+        op.execute(f"DROP TRIGGER IF EXISTS {counts}_{event} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {counts}_{event}()")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "book_facet_counts",
+        sa.Column("facet", sa.VARCHAR(), nullable=False),
+        sa.Column("uid", sa.UUID(), nullable=False),
+        sa.Column("count", sa.INTEGER(), nullable=False),
+        sa.PrimaryKeyConstraint("facet", "uid"),
+    )
+    op.create_table(
+        "author_nationality_counts",
+        sa.Column("nationality", sa.VARCHAR(), nullable=False),
+        sa.Column("count", sa.INTEGER(), nullable=False),
+        sa.PrimaryKeyConstraint("nationality"),
+    )
+
+    op.execute("""
+        CREATE FUNCTION book_facets(authors uuid[], categories uuid[], genres uuid[])
+        RETURNS TABLE (facet varchar, uid uuid)
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT 'author'::varchar, unnest(authors)
+            UNION
+            SELECT 'category'::varchar, unnest(categories)
+            UNION
+            SELECT 'genre'::varchar, unnest(genres)
+        $$
+        """)
+    create_count_triggers(
+        "books", "book_facet_counts", BOOK_FACET_COUNT_DELTAS, BOOK_FACET_ROWS
+    )
+    create_count_triggers(
+        "authors",
+        "author_nationality_counts",
+        AUTHOR_NATIONALITY_COUNT_DELTAS,
+        AUTHOR_NATIONALITY_ROWS,
+    )
+
+    # The triggers lock both tables against writes until this migration
+    # commits, so the backfill cannot race with them.
+    op.execute(
+        BOOK_FACET_COUNT_DELTAS.format(
+            changes=BOOK_FACET_ROWS.format(table="books", delta=1)
+        )
+    )
+    op.execute(
+        AUTHOR_NATIONALITY_COUNT_DELTAS.format(
+            changes=AUTHOR_NATIONALITY_ROWS.format(table="authors", delta=1)
+        )
+    )
+
+
+def downgrade() -> None:
+    drop_count_triggers("authors", "author_nationality_counts")
+    drop_count_triggers("books", "book_facet_counts")
+    op.execute("DROP FUNCTION IF EXISTS book_facets(uuid[], uuid[], uuid[])")
+    op.drop_table("author_nationality_counts")
+    op.drop_table("book_facet_counts")
@@ -0,0 +1,66 @@
+"""trigram_indexes
+
+Revision ID: 37d464b7cfc3
+Revises: 4fcddd58ae32
+Create Date: 2024-10-15 09:31:18.604512
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "37d464b7cfc3"
+down_revision: Union[str, None] = "4fcddd58ae32"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_books_title_trgm",
+            "books",
+            ["title"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_authors_pen_name_trgm",
+            "authors",
+            ["pen_name"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"pen_name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_authors_full_name_trgm",
+            "authors",
+            [sa.text("(first_name || ' ' || last_name) gin_trgm_ops")],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_authors_full_name_trgm",
+            table_name="authors",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_authors_pen_name_trgm",
+            table_name="authors",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_books_title_trgm", table_name="books", postgresql_concurrently=True
+        )
@@ -0,0 +1,37 @@
+"""book_array_indexes
+
+Revision ID: 3fac3c091a5e
+Revises: 0298b08a37c5
+Create Date: 2024-10-14 11:40:07.218734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "3fac3c091a5e"
+down_revision: Union[str, None] = "0298b08a37c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in ("authors", "categories", "genres"):
+            op.create_index(
+                f"ix_books_{column}",
+                "books",
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for column in ("authors", "categories", "genres"):
+            op.drop_index(
+                f"ix_books_{column}", table_name="books", postgresql_concurrently=True
+            )
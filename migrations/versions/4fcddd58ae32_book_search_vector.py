@@ -0,0 +1,46 @@
+"""book_search_vector
+
+Revision ID: 4fcddd58ae32
+Revises: 3fac3c091a5e
+Create Date: 2024-10-14 14:03:55.871420
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "4fcddd58ae32"
+down_revision: Union[str, None] = "3fac3c091a5e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "books",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_books_search_vector",
+        "books",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_books_search_vector", table_name="books")
+    op.drop_column("books", "search_vector")
@@ -0,0 +1,52 @@
+"""book_image_variants
+
+Revision ID: 7033e3445df2
+Revises: 37d464b7cfc3
+Create Date: 2024-10-16 10:48:26.117305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "7033e3445df2"
+down_revision: Union[str, None] = "37d464b7cfc3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "books",
+        "images",
+        existing_type=postgresql.ARRAY(sa.UUID()),
+        type_=postgresql.ARRAY(sa.VARCHAR()),
+        existing_nullable=False,
+        server_default=sa.text("'{}'"),
+        postgresql_using="images::varchar[]",
+    )
+    op.add_column(
+        "books",
+        sa.Column(
+            "image_variants",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("books", "image_variants")
+    op.alter_column(
+        "books",
+        "images",
+        existing_type=postgresql.ARRAY(sa.VARCHAR()),
+        type_=postgresql.ARRAY(sa.UUID()),
+        existing_nullable=False,
+        server_default=None,
+        postgresql_using="images::uuid[]",
+    )
@@ -0,0 +1,36 @@
+"""stored_images
+
+Revision ID: a81c4e2f9b3d
+Revises: 7033e3445df2
+Create Date: 2024-10-16 14:22:09.481726
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "a81c4e2f9b3d"
+down_revision: Union[str, None] = "7033e3445df2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stored_images",
+        sa.Column("digest", sa.VARCHAR(length=64), nullable=False),
+        sa.Column("object_name", sa.VARCHAR(), nullable=False),
+        sa.Column("content_type", sa.VARCHAR(), nullable=False),
+        sa.Column("size", sa.BIGINT(), nullable=False),
+        sa.Column("ref_count", sa.INTEGER(), nullable=False),
+        sa.Column("created_at", postgresql.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint("digest"),
+        sa.UniqueConstraint("object_name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("stored_images")
@@ -0,0 +1,38 @@
+"""upload_jobs
+
+Revision ID: c5d27e8a1f60
+Revises: a81c4e2f9b3d
+Create Date: 2024-10-16 16:05:37.902144
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "c5d27e8a1f60"
+down_revision: Union[str, None] = "a81c4e2f9b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "upload_jobs",
+        sa.Column("uid", sa.UUID(), nullable=False),
+        sa.Column("user_uid", sa.UUID(), nullable=False),
+        sa.Column("target", sa.VARCHAR(), nullable=False),
+        sa.Column("target_uid", sa.UUID(), nullable=False),
+        sa.Column("object_name", sa.VARCHAR(), nullable=True),
+        sa.Column("status", sa.VARCHAR(), nullable=False),
+        sa.Column("error", sa.TEXT(), nullable=True),
+        sa.Column("created_at", postgresql.TIMESTAMP(), nullable=False),
+        sa.Column("updated_at", postgresql.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint("uid"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("upload_jobs")
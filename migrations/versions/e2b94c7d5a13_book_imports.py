@@ -0,0 +1,47 @@
+"""book_imports
+
+Revision ID: e2b94c7d5a13
+Revises: c5d27e8a1f60
+Create Date: 2024-10-17 09:12:44.518230
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "e2b94c7d5a13"
+down_revision: Union[str, None] = "c5d27e8a1f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "book_imports",
+        sa.Column("uid", sa.UUID(), nullable=False),
+        sa.Column("user_uid", sa.UUID(), nullable=False),
+        sa.Column("object_name", sa.VARCHAR(), nullable=False),
+        sa.Column("format", sa.VARCHAR(), nullable=False),
+        sa.Column("status", sa.VARCHAR(), nullable=False),
+        sa.Column("total_rows", sa.INTEGER(), nullable=False),
+        sa.Column("imported_rows", sa.INTEGER(), nullable=False),
+        sa.Column("skipped_rows", sa.INTEGER(), nullable=False),
+        sa.Column("failed_rows", sa.INTEGER(), nullable=False),
+        sa.Column(
+            "errors",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default="[]",
+            nullable=False,
+        ),
+        sa.Column("error", sa.TEXT(), nullable=True),
+        sa.Column("created_at", postgresql.TIMESTAMP(), nullable=False),
+        sa.Column("updated_at", postgresql.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint("uid"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("book_imports")
@@ -0,0 +1,38 @@
+"""updated_at_indexes
+
+Revision ID: f4a1d9b6e027
+Revises: e2b94c7d5a13
+Create Date: 2024-10-17 14:38:02.731590
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "f4a1d9b6e027"
+down_revision: Union[str, None] = "e2b94c7d5a13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in ("books", "authors"):
+            op.create_index(
+                f"ix_{table}_updated_at_uid",
+                table,
+                ["updated_at", "uid"],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in ("books", "authors"):
+            op.drop_index(
+                f"ix_{table}_updated_at_uid",
+                table_name=table,
+                postgresql_concurrently=True,
+            )
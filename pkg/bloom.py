@@ -0,0 +1,27 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
@@ -0,0 +1,47 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        on_evict: Optional[Callable[[Hashable, bool], None]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            if self.on_evict is not None:
+                self.on_evict(key, True)
+            return default
+
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self.entries[key] = (value, expires_at)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            evicted_key, _ = self.entries.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted_key, False)
+
+    def delete(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
@@ -11,6 +11,7 @@ class Settings(BaseSettings):
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
 
     BCRYPT_ROUND: int = Field(..., env="BCRYPT_ROUND")
+    PASSWORD_HASH_WORKERS: int = Field(4, env="PASSWORD_HASH_WORKERS")
 
     MAIL_USER: str = Field(..., env="MAIL_USER")
     MAIL_PASSWORD: str = Field(..., env="MAIL_PASSWORD")
@@ -23,6 +24,35 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = Field(..., env="JWT_ALGORITHM")
 
     REDIS_URL: str = Field(..., env="REDIS_URL")
+
+    TOKEN_GENERATION_CACHE_SECONDS: int = Field(
+        30, env="TOKEN_GENERATION_CACHE_SECONDS"
+    )
+
+    TOKEN_BLACKLIST_BACKEND: str = Field("redis", env="TOKEN_BLACKLIST_BACKEND")
+    TOKEN_BLACKLIST_BLOOM_CAPACITY: int = Field(
+        100_000, env="TOKEN_BLACKLIST_BLOOM_CAPACITY"
+    )
+    TOKEN_BLACKLIST_BLOOM_ERROR_RATE: float = Field(
+        0.01, env="TOKEN_BLACKLIST_BLOOM_ERROR_RATE"
+    )
+    TOKEN_BLACKLIST_BLOOM_REBUILD_SECONDS: int = Field(
+        600, env="TOKEN_BLACKLIST_BLOOM_REBUILD_SECONDS"
+    )
+
+    RESPONSE_CACHE_TIERS: str = Field("local,redis", env="RESPONSE_CACHE_TIERS")
+    RESPONSE_CACHE_LOCAL_MAXSIZE: int = Field(
+        10_000, env="RESPONSE_CACHE_LOCAL_MAXSIZE"
+    )
+    RESPONSE_CACHE_LOCAL_TTL_SECONDS: int = Field(
+        30, env="RESPONSE_CACHE_LOCAL_TTL_SECONDS"
+    )
+    RESPONSE_CACHE_REDIS_TTL_SECONDS: int = Field(
+        300, env="RESPONSE_CACHE_REDIS_TTL_SECONDS"
+    )
+
+    BATCH_GET_MAX_SIZE: int = Field(200, env="BATCH_GET_MAX_SIZE")
+
     FLOWER_USERNAME: str = Field(..., env="FLOWER_USERNAME")
     FLOWER_PASSWORD: str = Field(..., env="FLOWER_PASSWORD")
 
@@ -32,6 +62,8 @@ class Settings(BaseSettings):
     MINIO_STORAGE_ENDPOINT: str = Field(..., env="MINIO_STORAGE_ENDPOINT")
     MINIO_ACCESS_KEY: str = Field(..., env="MINIO_ACCESS_KEY")
     MINIO_SECRET_KEY: str = Field(..., env="MINIO_SECRET_KEY")
+    MINIO_PUBLIC_ENDPOINT: str = Field("localhost:8080", env="MINIO_PUBLIC_ENDPOINT")
+    MINIO_REGION: str = Field("us-east-1", env="MINIO_REGION")
 
     DOMAIN: str = Field(..., env="DOMAIN")
 
@@ -1,7 +1,6 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlmodel import SQLModel
 
 from .config import Config
@@ -14,20 +13,39 @@ engine = create_async_engine(
     max_overflow=5,
 )
 
+async_session_maker = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+    autocommit=False,
+)
+
 
 async def initdb():
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async_session = sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autoflush=False,
-        autocommit=False,
-    )
+class SessionProvider:
+    def __init__(self, session_maker: async_sessionmaker):
+        self.session_maker = session_maker
+
+    async def __call__(self) -> AsyncGenerator[AsyncSession, None]:
+        async with self.session_maker() as session:
+            yield session
+
+    def pool_metrics(self) -> dict:
+        pool = self.session_maker.kw["bind"].pool
+        queue = getattr(getattr(pool, "_pool", None), "_queue", None)
+
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "waiters": len(getattr(queue, "_getters", None) or ()),
+        }
+
 
-    async with async_session() as session:
-        yield session
+get_session = SessionProvider(async_session_maker)
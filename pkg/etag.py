@@ -0,0 +1,43 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(uid, updated_at: datetime) -> str:
+    return f'"{uid}-{int(updated_at.timestamp() * 1_000_000):x}"'
+
+
+def make_weak_etag(versions: Iterable[tuple]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for version in versions:
+        digest.update(
+            ":".join(
+                value.isoformat() if isinstance(value, datetime) else str(value)
+                for value in version
+            ).encode("utf-8")
+            + b";"
+        )
+
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or not etag:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,61 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from prometheus_client import Gauge, Histogram
+
+from .config import Config
+from .utils import generate_password_hash, verify_password
+
+password_hash_queue_seconds = Histogram(
+    "bookly_password_hash_queue_seconds",
+    "Time password hashing jobs spend waiting for a worker thread",
+    ["operation"],
+)
+password_hash_seconds = Histogram(
+    "bookly_password_hash_seconds",
+    "Time spent running password hashing jobs",
+    ["operation"],
+)
+password_hash_pending = Gauge(
+    "bookly_password_hash_pending",
+    "Password hashing jobs submitted but not yet finished",
+)
+
+
+class PasswordHasher:
+    def __init__(self, max_workers: int):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+
+    def _run(self, operation: str, submitted_at: float, func, *args):
+        started_at = time.perf_counter()
+        password_hash_queue_seconds.labels(operation).observe(started_at - submitted_at)
+
+        try:
+            return func(*args)
+        finally:
+            password_hash_seconds.labels(operation).observe(
+                time.perf_counter() - started_at
+            )
+
+    async def _submit(self, operation: str, func, *args):
+        loop = asyncio.get_running_loop()
+
+        password_hash_pending.inc()
+        try:
+            return await loop.run_in_executor(
+                self.executor, self._run, operation, time.perf_counter(), func, *args
+            )
+        finally:
+            password_hash_pending.dec()
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", generate_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._submit("verify", verify_password, password, hashed_password)
+
+
+password_hasher = PasswordHasher(Config.PASSWORD_HASH_WORKERS)
@@ -0,0 +1,63 @@
+import os
+from io import BytesIO
+from typing import Iterator, NamedTuple, Optional
+
+from PIL import Image, ImageOps, features
+
+THUMBNAIL_SIZE = (200, 300)
+VARIANT_WIDTHS = (320, 640, 1024)
+VARIANT_FORMATS = [("AVIF", "image/avif", ".avif"), ("WEBP", "image/webp", ".webp")]
+
+
+class ImageVariant(NamedTuple):
+    name: str
+    content_type: str
+    width: Optional[int]
+    data: bytes
+
+
+def parse_variant_name(name: str) -> tuple[str, Optional[int]]:
+    stem, extension = os.path.splitext(name)
+    content_type = next(
+        content_type
+        for _, content_type, variant_extension in VARIANT_FORMATS
+        if variant_extension == extension
+    )
+    width = int(stem[1:]) if stem.startswith("w") else None
+
+    return content_type, width
+
+
+def _encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, quality=80)
+    return buffer.getvalue()
+
+
+def _load(data: bytes) -> Image.Image:
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        mode = "RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB"
+        return image.convert(mode)
+
+
+def render_image_variants(data: bytes) -> Iterator[ImageVariant]:
+    image = _load(data)
+
+    thumbnail = ImageOps.fit(image, THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    yield ImageVariant("thumbnail.webp", "image/webp", None, _encode(thumbnail, "WEBP"))
+
+    widths = [width for width in VARIANT_WIDTHS if width < image.width] or [image.width]
+    for image_format, content_type, extension in VARIANT_FORMATS:
+        if not features.check(image_format.lower()):
+            continue
+
+        for width in widths:
+            height = round(image.height * width / image.width)
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            yield ImageVariant(
+                f"w{width}{extension}",
+                content_type,
+                width,
+                _encode(resized, image_format),
+            )
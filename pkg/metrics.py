@@ -0,0 +1,20 @@
+from fastapi import FastAPI
+from prometheus_client import REGISTRY, make_asgi_app
+from prometheus_client.core import GaugeMetricFamily
+
+from .db import get_session
+
+
+class SessionPoolCollector:
+    def collect(self):
+        for name, value in get_session.pool_metrics().items():
+            yield GaugeMetricFamily(
+                f"bookly_db_pool_{name}",
+                f"Database connection pool {name.replace('_', ' ')}",
+                value=value,
+            )
+
+
+def register_metrics(app: FastAPI, path: str):
+    REGISTRY.register(SessionPoolCollector())
+    app.mount(path, make_asgi_app())
@@ -39,6 +39,7 @@ def register_middleware(app: FastAPI):
         CORSMiddleware,
         allow_origins=["bookly.serveo.net", "localhost"],
         allow_methods=["*"],
-        allow_headers=["Content-Type", "Authorization"],
+        allow_headers=["Content-Type", "Authorization", "If-None-Match"],
+        expose_headers=["ETag"],
         allow_credentials=True,
     )
@@ -0,0 +1,41 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    payload = json.dumps(
+        [_dump_value(value) for value in values], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def _parse_value(parser: Callable[[Any], Any], value: Any) -> Any:
+    # Cursors only ever hold strings and numbers, and a client-made value of
+    # any other type must not reach a parser such as uuid.UUID.
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise ValueError("Cursor value has the wrong type")
+    return parser(value)
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> tuple:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("Cursor has the wrong shape")
+        return tuple(
+            _parse_value(parser, value) for parser, value in zip(parsers, values)
+        )
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,44 @@
+from typing import Any, Iterable, Optional
+
+from sqlalchemy.orm import load_only
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+def parse_page_size(
+    value: Optional[str],
+    default: int = DEFAULT_PAGE_SIZE,
+    maximum: int = MAX_PAGE_SIZE,
+) -> int:
+    try:
+        limit = int(value) if value else default
+    except ValueError:
+        return default
+
+    return min(max(limit, 1), maximum)
+
+
+def parse_fields(value: Optional[str], allowed: Iterable[str]) -> Optional[tuple]:
+    if not value:
+        return None
+
+    fields = tuple(dict.fromkeys(filter(None, map(str.strip, value.split(",")))))
+    if not fields or any(field not in allowed for field in fields):
+        raise ValueError("Invalid fields")
+
+    return fields
+
+
+def load_fields(model, fields: Optional[Iterable[str]], *required: str):
+    if fields is None:
+        return ()
+
+    columns = dict.fromkeys((*required, *fields))
+    return (load_only(*(getattr(model, field) for field in columns), raiseload=True),)
+
+
+def project(items: Iterable[Any], fields: Iterable[str]) -> list[dict]:
+    return [
+        {field: getattr(item, field) for field in ("uid", *fields)} for item in items
+    ]
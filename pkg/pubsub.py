@@ -0,0 +1,72 @@
+import asyncio
+import inspect
+from collections import defaultdict
+from typing import Callable
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from .redis import redis_client
+
+
+class PubSub:
+    def __init__(self):
+        self.handlers: dict[str, list[Callable]] = defaultdict(list)
+        self.reconnect_handlers: list[Callable] = []
+        self.task = None
+
+    def subscribe(self, channel: str, handler: Callable) -> None:
+        self.handlers[channel].append(handler)
+
+    def on_reconnect(self, handler: Callable) -> None:
+        self.reconnect_handlers.append(handler)
+
+    async def publish(self, channel: str, message: str) -> None:
+        await redis_client.publish(channel, message)
+
+    async def _call(self, handler: Callable, *args) -> None:
+        try:
+            result = handler(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"Error handling pub/sub message: {e}")
+
+    async def _listen(self) -> None:
+        connected_before = False
+
+        while True:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(*self.handlers)
+
+                if connected_before:
+                    for handler in self.reconnect_handlers:
+                        await self._call(handler)
+                connected_before = True
+
+                async for message in pubsub.listen():
+                    channel = message["channel"].decode("utf-8")
+                    data = message["data"].decode("utf-8")
+                    for handler in self.handlers[channel]:
+                        await self._call(handler, data)
+            except (RedisConnectionError, OSError) as e:
+                print(f"Pub/sub connection lost: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        if self.handlers and self.task is None:
+            self.task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+
+pubsub = PubSub()
@@ -0,0 +1,5 @@
+import redis.asyncio as redis
+
+from .config import Config
+
+redis_client = redis.from_url(Config.REDIS_URL)
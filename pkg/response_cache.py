@@ -0,0 +1,346 @@
+import json
+from collections import defaultdict
+from typing import Hashable, Iterable, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+
+from .cache import TTLCache
+from .config import Config
+from .etag import etag_matches, not_modified_response
+from .pubsub import pubsub
+from .redis import redis_client
+
+RESPONSE_CACHE_CHANNEL = "response_cache"
+RESPONSE_CACHE_KEY_PREFIX = "response_cache:"
+RESPONSE_CACHE_TAG_PREFIX = "response_cache_tag:"
+RESPONSE_CACHE_GENERATION_KEY = "response_cache_generation"
+RESPONSE_CACHE_TAG_GENERATION_PREFIX = "response_cache_tag_generation:"
+
+# Each invalidation bumps a global generation and stamps it on its tags. A
+# response computed before that bump is not written back under those tags.
+RESPONSE_CACHE_INVALIDATE_SCRIPT = """
+local generation = redis.call("INCR", KEYS[1])
+for i = 2, #KEYS do
+    redis.call("SET", KEYS[i], generation, "EX", ARGV[1])
+end
+return generation
+"""
+RESPONSE_CACHE_SET_SCRIPT = """
+local tag_count = (#KEYS - 1) / 2
+local generation = tonumber(ARGV[1])
+if generation then
+    for i = tag_count + 2, #KEYS do
+        if tonumber(redis.call("GET", KEYS[i]) or "0") > generation then
+            return 0
+        end
+    end
+end
+redis.call("HSET", KEYS[1], "body", ARGV[3], "tags", ARGV[4], "etag", ARGV[5])
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+for i = 2, tag_count + 1 do
+    redis.call("SADD", KEYS[i], KEYS[1])
+    redis.call("EXPIRE", KEYS[i], ARGV[2])
+end
+return 1
+"""
+
+response_cache_hits = Counter(
+    "bookly_response_cache_hits_total",
+    "Cached responses served, by the tier that had them",
+    ["tier"],
+)
+response_cache_misses = Counter(
+    "bookly_response_cache_misses_total",
+    "Response cache lookups that a tier could not answer",
+    ["tier"],
+)
+response_cache_evictions = Counter(
+    "bookly_response_cache_evictions_total",
+    "Entries dropped from the in-process response cache before invalidation",
+    ["reason"],
+)
+
+
+class LocalResponseCacheTier:
+    name = "local"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize, ttl, on_evict=self._evicted)
+        self.tag_keys: dict[str, set] = defaultdict(set)
+        self.key_tags: dict[Hashable, tuple] = {}
+        self.generation = 0
+        self.cleared_generation = 0
+        self.tag_generations = TTLCache(maxsize, ttl)
+
+    def _forget(self, key: Hashable) -> None:
+        for tag in self.key_tags.pop(key, ()):
+            keys = self.tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_keys[tag]
+
+    def _evicted(self, key: Hashable, expired: bool) -> None:
+        response_cache_evictions.labels("expired" if expired else "capacity").inc()
+        self._forget(key)
+
+    async def get(self, key: str) -> Optional[tuple[bytes, tuple, Optional[str]]]:
+        return self.entries.get(key)
+
+    async def get_generation(self) -> int:
+        return self.generation
+
+    async def set(
+        self,
+        key: str,
+        body: bytes,
+        tags: tuple,
+        etag: Optional[str] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        if generation is not None and (
+            generation < self.cleared_generation
+            or any(self.tag_generations.get(tag, 0) > generation for tag in tags)
+        ):
+            return
+
+        self._forget(key)
+        self.entries.set(key, (body, tags, etag))
+        self.key_tags[key] = tags
+        for tag in tags:
+            self.tag_keys[tag].add(key)
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        self.generation += 1
+        for tag in tags:
+            self.tag_generations.set(tag, self.generation)
+            for key in list(self.tag_keys.get(tag, ())):
+                self.entries.delete(key)
+                self._forget(key)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.cleared_generation = self.generation
+        self.entries.clear()
+        self.tag_keys.clear()
+        self.key_tags.clear()
+
+
+class RedisResponseCacheTier:
+    name = "redis"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.invalidate_script = redis_client.register_script(
+            RESPONSE_CACHE_INVALIDATE_SCRIPT
+        )
+        self.set_script = redis_client.register_script(RESPONSE_CACHE_SET_SCRIPT)
+
+    async def get(self, key: str) -> Optional[tuple[bytes, tuple, Optional[str]]]:
+        entry = await redis_client.hgetall(f"{RESPONSE_CACHE_KEY_PREFIX}{key}")
+        if not entry:
+            return None
+
+        tags = entry[b"tags"].decode("utf-8")
+        etag = entry.get(b"etag", b"").decode("utf-8")
+        return entry[b"body"], tuple(tags.split(",")) if tags else (), etag or None
+
+    async def get_generation(self) -> int:
+        return int(await redis_client.get(RESPONSE_CACHE_GENERATION_KEY) or 0)
+
+    async def set(
+        self,
+        key: str,
+        body: bytes,
+        tags: tuple,
+        etag: Optional[str] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        await self.set_script(
+            keys=[
+                f"{RESPONSE_CACHE_KEY_PREFIX}{key}",
+                *(f"{RESPONSE_CACHE_TAG_PREFIX}{tag}" for tag in tags),
+                *(f"{RESPONSE_CACHE_TAG_GENERATION_PREFIX}{tag}" for tag in tags),
+            ],
+            args=[
+                "" if generation is None else generation,
+                self.ttl,
+                body,
+                ",".join(tags),
+                etag or "",
+            ],
+        )
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        await self.invalidate_script(
+            keys=[
+                RESPONSE_CACHE_GENERATION_KEY,
+                *(f"{RESPONSE_CACHE_TAG_GENERATION_PREFIX}{tag}" for tag in tags),
+            ],
+            args=[self.ttl],
+        )
+
+        tag_keys = [f"{RESPONSE_CACHE_TAG_PREFIX}{tag}" for tag in tags]
+        redis_keys = set()
+        for tag_key in tag_keys:
+            redis_keys |= await redis_client.smembers(tag_key)
+
+        await redis_client.delete(*redis_keys, *tag_keys)
+
+
+class ResponseCache:
+    def __init__(self, tiers: list):
+        self.tiers = tiers
+        self.local_tiers = [
+            tier for tier in tiers if isinstance(tier, LocalResponseCacheTier)
+        ]
+
+    @staticmethod
+    def get_key(request: Request) -> str:
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    async def get(self, key: str) -> Optional[tuple[bytes, Optional[str]]]:
+        for index, tier in enumerate(self.tiers):
+            try:
+                entry = await tier.get(key)
+            except (RedisError, OSError) as e:
+                print(f"Error reading {tier.name} response cache: {e}")
+                continue
+
+            if entry is None:
+                response_cache_misses.labels(tier.name).inc()
+                continue
+
+            response_cache_hits.labels(tier.name).inc()
+            for upper_tier in self.tiers[:index]:
+                try:
+                    await upper_tier.set(key, *entry)
+                except (RedisError, OSError) as e:
+                    print(f"Error writing {upper_tier.name} response cache: {e}")
+
+            return entry[0], entry[2]
+
+        return None
+
+    async def get_generations(self) -> dict:
+        generations = {}
+        for tier in self.tiers:
+            try:
+                generations[tier.name] = await tier.get_generation()
+            except (RedisError, OSError) as e:
+                print(f"Error reading {tier.name} response cache generation: {e}")
+
+        return generations
+
+    async def set(
+        self,
+        key: str,
+        body: bytes,
+        tags: Iterable[str],
+        etag: Optional[str] = None,
+        generations: Optional[dict] = None,
+    ) -> None:
+        tags = tuple(tags)
+        for tier in self.tiers:
+            if generations is not None and tier.name not in generations:
+                continue
+
+            try:
+                await tier.set(
+                    key,
+                    body,
+                    tags,
+                    etag,
+                    None if generations is None else generations[tier.name],
+                )
+            except (RedisError, OSError) as e:
+                print(f"Error writing {tier.name} response cache: {e}")
+
+    async def invalidate(self, *tags: str) -> None:
+        for tier in self.tiers:
+            try:
+                await tier.invalidate(tags)
+            except (RedisError, OSError) as e:
+                print(f"Error invalidating {tier.name} response cache: {e}")
+
+        if self.local_tiers:
+            try:
+                await pubsub.publish(RESPONSE_CACHE_CHANNEL, json.dumps(tags))
+            except (RedisError, OSError) as e:
+                print(f"Error publishing response cache invalidation: {e}")
+
+    async def invalidate_local(self, message: str) -> None:
+        for tier in self.local_tiers:
+            await tier.invalidate(json.loads(message))
+
+    def clear_local(self) -> None:
+        for tier in self.local_tiers:
+            tier.clear()
+
+    async def get_response(self, request: Request) -> Optional[Response]:
+        if not self.tiers:
+            return None
+
+        entry = await self.get(self.get_key(request))
+        if entry is None:
+            # Taken before the handler reads anything, so set_response can tell
+            # whether an invalidation landed while the response was computed.
+            request.state.response_cache_generations = await self.get_generations()
+            return None
+
+        body, etag = entry
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+
+        headers = {"X-Cache": "HIT"}
+        if etag:
+            headers["ETag"] = etag
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def set_response(
+        self, request: Request, response: Response, tags: Iterable[str]
+    ) -> Response:
+        generations = getattr(request.state, "response_cache_generations", None)
+        if self.tiers and response.status_code == 200 and generations is not None:
+            await self.set(
+                self.get_key(request),
+                response.body,
+                tags,
+                response.headers.get("etag"),
+                generations,
+            )
+            response.headers["X-Cache"] = "MISS"
+
+        return response
+
+
+def build_response_cache_tiers(names: str) -> list:
+    tiers = []
+    for name in filter(None, (name.strip() for name in names.split(","))):
+        if name == "local":
+            tiers.append(
+                LocalResponseCacheTier(
+                    Config.RESPONSE_CACHE_LOCAL_MAXSIZE,
+                    Config.RESPONSE_CACHE_LOCAL_TTL_SECONDS,
+                )
+            )
+        elif name == "redis":
+            tiers.append(
+                RedisResponseCacheTier(Config.RESPONSE_CACHE_REDIS_TTL_SECONDS)
+            )
+        else:
+            raise ValueError(f"Unknown response cache tier: {name}")
+
+    return tiers
+
+
+response_cache = ResponseCache(build_response_cache_tiers(Config.RESPONSE_CACHE_TIERS))
+
+pubsub.subscribe(RESPONSE_CACHE_CHANNEL, response_cache.invalidate_local)
+pubsub.on_reconnect(response_cache.clear_local)
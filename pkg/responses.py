@@ -0,0 +1,11 @@
+from typing import Any
+
+from fastapi.responses import Response
+from pydantic_core import to_json
+
+
+class JSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
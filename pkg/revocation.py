@@ -0,0 +1,42 @@
+from .cache import TTLCache
+from .config import Config
+from .pubsub import pubsub
+from .redis import redis_client
+
+TOKEN_GENERATION_CHANNEL = "token_generation"
+TOKEN_GENERATION_KEY_PREFIX = "token_generation:"
+
+
+class TokenRevocation:
+    def __init__(self, cache_ttl: float):
+        self.cache = TTLCache(maxsize=100_000, ttl=cache_ttl)
+
+    async def get_generation(self, user_uid: str, fresh: bool = False) -> int:
+        # Tokens are stamped with a fresh read, because a stale cached value
+        # would be below what other workers hold and get the token rejected.
+        generation = None if fresh else self.cache.get(user_uid)
+        if generation is None:
+            value = await redis_client.get(f"{TOKEN_GENERATION_KEY_PREFIX}{user_uid}")
+            generation = int(value) if value else 0
+            self.cache.set(user_uid, generation)
+
+        return generation
+
+    async def is_revoked(self, user_uid: str, generation: int) -> bool:
+        return generation < await self.get_generation(user_uid)
+
+    async def revoke_user_tokens(self, user_uid: str) -> int:
+        generation = await redis_client.incr(f"{TOKEN_GENERATION_KEY_PREFIX}{user_uid}")
+        self.cache.set(user_uid, generation)
+        await pubsub.publish(TOKEN_GENERATION_CHANNEL, user_uid)
+
+        return generation
+
+    def invalidate(self, user_uid: str) -> None:
+        self.cache.delete(user_uid)
+
+
+token_revocation = TokenRevocation(Config.TOKEN_GENERATION_CACHE_SECONDS)
+
+pubsub.subscribe(TOKEN_GENERATION_CHANNEL, token_revocation.invalidate)
+pubsub.on_reconnect(token_revocation.cache.clear)
@@ -1,7 +1,26 @@
+import hashlib
+from datetime import timedelta
+from io import BytesIO, TextIOWrapper
+from typing import BinaryIO, Iterator, Optional
+
 from minio import Minio
+from minio.commonconfig import REPLACE, CopySource
+from minio.datatypes import Object
+from minio.error import S3Error
+from starlette.concurrency import run_in_threadpool
 
 from .config import Config
 
+UPLOAD_PART_SIZE = 5 * 1024 * 1024
+IMAGE_MAX_SIZE = 20 * 1024 * 1024
+IMAGE_CONTENT_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 minio_client = Minio(
     endpoint=Config.MINIO_STORAGE_ENDPOINT,
     access_key=Config.MINIO_ACCESS_KEY,
@@ -9,6 +28,188 @@ minio_client = Minio(
     secure=False,
 )
 
+presign_client = Minio(
+    endpoint=Config.MINIO_PUBLIC_ENDPOINT,
+    access_key=Config.MINIO_ACCESS_KEY,
+    secret_key=Config.MINIO_SECRET_KEY,
+    secure=False,
+    region=Config.MINIO_REGION,
+)
+
 if not minio_client.bucket_exists(Config.MINIO_STORAGE_BUCKET):
     minio_client.make_bucket(Config.MINIO_STORAGE_BUCKET)
     print(f"Bucket {Config.MINIO_STORAGE_BUCKET} created")
+
+
+def get_object_url(object_name: str) -> str:
+    return f"http://{Config.DOMAIN}/minio/storage/{Config.MINIO_STORAGE_BUCKET}/{object_name}"
+
+
+def get_object_name(object_url: str) -> Optional[str]:
+    prefix = get_object_url("")
+    if not object_url or not object_url.startswith(prefix):
+        return None
+
+    return object_url.removeprefix(prefix)
+
+
+def _cache_control_metadata(cache_control: Optional[str]) -> Optional[dict]:
+    return {"Cache-Control": cache_control} if cache_control else None
+
+
+async def upload_fileobj(
+    object_name: str,
+    file: BinaryIO,
+    content_type: str,
+    cache_control: Optional[str] = None,
+) -> None:
+    file.seek(0)
+    await run_in_threadpool(
+        minio_client.put_object,
+        bucket_name=Config.MINIO_STORAGE_BUCKET,
+        object_name=object_name,
+        data=file,
+        length=-1,
+        part_size=UPLOAD_PART_SIZE,
+        content_type=content_type,
+        metadata=_cache_control_metadata(cache_control),
+    )
+
+
+def _hash_fileobj(file: BinaryIO) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+
+    file.seek(0)
+    while chunk := file.read(UPLOAD_PART_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    file.seek(0)
+
+    return digest.hexdigest(), size
+
+
+async def hash_fileobj(file: BinaryIO) -> tuple[str, int]:
+    return await run_in_threadpool(_hash_fileobj, file)
+
+
+def _hash_object(object_name: str) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+
+    response = minio_client.get_object(
+        bucket_name=Config.MINIO_STORAGE_BUCKET, object_name=object_name
+    )
+    try:
+        for chunk in response.stream(UPLOAD_PART_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    finally:
+        response.close()
+        response.release_conn()
+
+    return digest.hexdigest(), size
+
+
+async def hash_object(object_name: str) -> tuple[str, int]:
+    return await run_in_threadpool(_hash_object, object_name)
+
+
+async def copy_object(
+    source_name: str,
+    object_name: str,
+    content_type: str,
+    cache_control: Optional[str] = None,
+) -> None:
+    await run_in_threadpool(
+        minio_client.copy_object,
+        bucket_name=Config.MINIO_STORAGE_BUCKET,
+        object_name=object_name,
+        source=CopySource(Config.MINIO_STORAGE_BUCKET, source_name),
+        metadata={
+            "Content-Type": content_type,
+            **(_cache_control_metadata(cache_control) or {}),
+        },
+        metadata_directive=REPLACE,
+    )
+
+
+def get_presigned_upload_url(object_name: str, expires: timedelta) -> str:
+    return presign_client.presigned_put_object(
+        bucket_name=Config.MINIO_STORAGE_BUCKET,
+        object_name=object_name,
+        expires=expires,
+    )
+
+
+async def stat_object(object_name: str) -> Optional[Object]:
+    try:
+        return await run_in_threadpool(
+            minio_client.stat_object,
+            bucket_name=Config.MINIO_STORAGE_BUCKET,
+            object_name=object_name,
+        )
+    except S3Error as e:
+        if e.code in ("NoSuchKey", "NoSuchObject"):
+            return None
+        raise
+
+
+async def remove_object(object_name: str) -> None:
+    await run_in_threadpool(
+        minio_client.remove_object,
+        bucket_name=Config.MINIO_STORAGE_BUCKET,
+        object_name=object_name,
+    )
+
+
+def list_object_names(prefix: str) -> list[str]:
+    return [
+        item.object_name
+        for item in minio_client.list_objects(
+            Config.MINIO_STORAGE_BUCKET, prefix=prefix, recursive=True
+        )
+    ]
+
+
+async def remove_objects(prefix: str) -> None:
+    for object_name in await run_in_threadpool(list_object_names, prefix):
+        await remove_object(object_name)
+
+
+def get_object_bytes(object_name: str) -> bytes:
+    response = minio_client.get_object(
+        bucket_name=Config.MINIO_STORAGE_BUCKET, object_name=object_name
+    )
+    try:
+        return response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def iter_object_lines(object_name: str) -> Iterator[str]:
+    response = minio_client.get_object(
+        bucket_name=Config.MINIO_STORAGE_BUCKET, object_name=object_name
+    )
+    try:
+        yield from TextIOWrapper(response, encoding="utf-8-sig", newline="")
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def put_object_bytes(
+    object_name: str,
+    data: bytes,
+    content_type: str,
+    cache_control: Optional[str] = None,
+) -> None:
+    minio_client.put_object(
+        bucket_name=Config.MINIO_STORAGE_BUCKET,
+        object_name=object_name,
+        data=BytesIO(data),
+        length=len(data),
+        content_type=content_type,
+        metadata=_cache_control_metadata(cache_control),
+    )
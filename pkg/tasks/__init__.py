@@ -1,2 +1 @@
 from .send_mail import send_email_task
-from .upload_image import upload_image_task
@@ -1,10 +1,12 @@
 from datetime import datetime
+from typing import Optional
 
 import bcrypt
 from fastapi import Cookie, HTTPException, status
-from itsdangerous import URLSafeTimedSerializer
+from itsdangerous import BadSignature, URLSafeTimedSerializer
 
 from .config import Config
+from .revocation import token_revocation
 
 url_safe_timed_serializer = URLSafeTimedSerializer(
     secret_key=Config.JWT_SECRET, salt=Config.JWT_SALT
@@ -20,15 +22,27 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
-def generate_url_safe_token(data: dict) -> str:
-    return url_safe_timed_serializer.dumps(data)
+def generate_url_safe_token(data: dict, salt: Optional[str] = None) -> str:
+    return url_safe_timed_serializer.dumps(data, salt=salt)
 
 
-def decode_url_safe_token(token: str) -> dict:
-    return url_safe_timed_serializer.loads(token)
+def decode_url_safe_token(token: str, salt: Optional[str] = None) -> dict:
+    return url_safe_timed_serializer.loads(token, salt=salt)
 
 
-def verify_url_safe_token(token: str) -> str:
+def get_url_safe_token_data(token: str, salt: Optional[str] = None) -> dict:
+    try:
+        return decode_url_safe_token(token, salt)
+    except BadSignature:
+        return {}
+
+
+def get_url_safe_token_expiry(token: str) -> datetime:
+    expires_at = get_url_safe_token_data(token).get("expires_at")
+    return datetime.fromtimestamp(expires_at) if expires_at else datetime.now()
+
+
+def verify_url_safe_token(token: str) -> dict:
     data = decode_url_safe_token(token)
 
     user_uid = data.get("user_uid")
@@ -46,14 +60,23 @@ def verify_url_safe_token(token: str) -> str:
             detail="Access token expired",
         )
 
-    return user_uid
+    return data
 
 
-def get_current_user_uid(access_token: str = Cookie(None)) -> str:
+async def get_current_user_uid(access_token: str = Cookie(None)) -> str:
     if access_token is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Access token required",
         )
 
-    return verify_url_safe_token(access_token)
+    data = verify_url_safe_token(access_token)
+    user_uid = data["user_uid"]
+
+    if await token_revocation.is_revoked(user_uid, data.get("generation", 0)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Access token revoked",
+        )
+
+    return user_uid
@@ -1,10 +1,22 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from pkg.metrics import register_metrics
 from pkg.middleware import register_middleware
+from pkg.pubsub import pubsub
+from src.auth.blacklist import (
+    rebuild_token_blacklist_filter,
+    refresh_token_blacklist_filter,
+)
 from src.auth.routes import auth_router
 from src.authors.routes import author_router
+from src.books.cache import book_category_cache, book_genre_cache
 from src.books.routes import book_category_router, book_genre_router, book_router
+from src.changes.routes import change_router
 from src.profile.routes import profile_router
+from src.uploads.routes import upload_router
 
 version = "v1"
 
@@ -17,6 +29,21 @@ This REST API Can:
 
 version_prefix = f"/api/{version}"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await rebuild_token_blacklist_filter()
+    await pubsub.start()
+    await book_category_cache.warm()
+    await book_genre_cache.warm()
+    refresh_task = asyncio.create_task(refresh_token_blacklist_filter())
+
+    yield
+
+    refresh_task.cancel()
+    await pubsub.stop()
+
+
 app = FastAPI(
     title="Bookly",
     description=description,
@@ -30,10 +57,12 @@ app = FastAPI(
     openapi_url=f"{version_prefix}/openapi.json",
     docs_url=f"{version_prefix}/docs",
     redoc_url=f"{version_prefix}/redoc",
+    lifespan=lifespan,
 )
 
 
 register_middleware(app)
+register_metrics(app, f"{version_prefix}/metrics")
 
 
 app.include_router(auth_router, prefix=f"{version_prefix}/auth", tags=["auth"])
@@ -50,3 +79,5 @@ app.include_router(
 )
 app.include_router(author_router, prefix=f"{version_prefix}/authors", tags=["authors"])
 app.include_router(book_router, prefix=f"{version_prefix}/books", tags=["books"])
+app.include_router(upload_router, prefix=f"{version_prefix}/uploads", tags=["uploads"])
+app.include_router(change_router, prefix=f"{version_prefix}/changes", tags=["changes"])
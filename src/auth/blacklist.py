@@ -0,0 +1,136 @@
+import asyncio
+import hashlib
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pkg.bloom import BloomFilter
+from pkg.config import Config
+from pkg.db import get_session
+from pkg.pubsub import pubsub
+from pkg.redis import redis_client
+
+from .models import TokenBlacklist
+
+TOKEN_BLACKLIST_CHANNEL = "token_blacklist"
+TOKEN_BLACKLIST_KEY_PREFIX = "token_blacklist:"
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class RedisTokenBlacklistStore:
+    async def add(
+        self, token: str, expires_at: datetime, session: AsyncSession
+    ) -> None:
+        ttl = int((expires_at - datetime.now()).total_seconds())
+        if ttl <= 0:
+            return
+
+        await redis_client.set(
+            f"{TOKEN_BLACKLIST_KEY_PREFIX}{token_digest(token)}", 1, ex=ttl
+        )
+
+    async def contains(self, token: str, session: AsyncSession) -> bool:
+        return bool(
+            await redis_client.exists(
+                f"{TOKEN_BLACKLIST_KEY_PREFIX}{token_digest(token)}"
+            )
+        )
+
+    async def digests(self) -> AsyncIterator[str]:
+        async for key in redis_client.scan_iter(
+            match=f"{TOKEN_BLACKLIST_KEY_PREFIX}*", count=1000
+        ):
+            yield key.decode("utf-8").removeprefix(TOKEN_BLACKLIST_KEY_PREFIX)
+
+    async def clear_expired(self, session: AsyncSession) -> None:
+        pass
+
+
+class PostgresTokenBlacklistStore:
+    async def add(
+        self, token: str, expires_at: datetime, session: AsyncSession
+    ) -> None:
+        token_blacklist = TokenBlacklist(token=token, expires_at=expires_at)
+        session.add(token_blacklist)
+        await session.commit()
+
+    async def contains(self, token: str, session: AsyncSession) -> bool:
+        result = await session.execute(
+            select(TokenBlacklist.uid).where(TokenBlacklist.token == token)
+        )
+        return result.first() is not None
+
+    async def digests(self) -> AsyncIterator[str]:
+        async for session in get_session():
+            result = await session.stream_scalars(
+                select(TokenBlacklist.token).where(
+                    TokenBlacklist.expires_at >= datetime.now()
+                )
+            )
+            async for token in result:
+                yield token_digest(token)
+
+    async def clear_expired(self, session: AsyncSession) -> None:
+        stmt = delete(TokenBlacklist).where(TokenBlacklist.expires_at < datetime.now())
+        await session.execute(stmt)
+        await session.commit()
+
+
+class TokenBlacklistFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.next_bloom = None
+        self.ready = False
+
+    def add(self, digest: str) -> None:
+        self.bloom.add(digest)
+        if self.next_bloom is not None:
+            self.next_bloom.add(digest)
+
+    def might_contain(self, digest: str) -> bool:
+        return not self.ready or digest in self.bloom
+
+    async def rebuild(self, digests: AsyncIterator[str]) -> None:
+        self.next_bloom = BloomFilter(self.capacity, self.error_rate)
+        try:
+            async for digest in digests:
+                self.next_bloom.add(digest)
+            self.bloom = self.next_bloom
+            self.ready = True
+        finally:
+            self.next_bloom = None
+
+
+if Config.TOKEN_BLACKLIST_BACKEND == "postgres":
+    token_blacklist_store = PostgresTokenBlacklistStore()
+else:
+    token_blacklist_store = RedisTokenBlacklistStore()
+
+token_blacklist_filter = TokenBlacklistFilter(
+    Config.TOKEN_BLACKLIST_BLOOM_CAPACITY, Config.TOKEN_BLACKLIST_BLOOM_ERROR_RATE
+)
+
+
+async def rebuild_token_blacklist_filter() -> None:
+    try:
+        await token_blacklist_filter.rebuild(token_blacklist_store.digests())
+    except Exception as e:
+        token_blacklist_filter.ready = False
+        print(f"Error rebuilding token blacklist filter: {e}")
+
+
+async def refresh_token_blacklist_filter() -> None:
+    while True:
+        await asyncio.sleep(Config.TOKEN_BLACKLIST_BLOOM_REBUILD_SECONDS)
+        await rebuild_token_blacklist_filter()
+
+
+pubsub.subscribe(TOKEN_BLACKLIST_CHANNEL, token_blacklist_filter.add)
+pubsub.on_reconnect(rebuild_token_blacklist_filter)
@@ -1,18 +1,19 @@
-import json
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from pkg.config import Config
 from pkg.db import get_session
+from pkg.hashing import password_hasher
+from pkg.responses import JSONResponse
+from pkg.revocation import token_revocation
 from pkg.tasks import send_email_task
 from pkg.utils import (
     decode_url_safe_token,
-    generate_password_hash,
     generate_url_safe_token,
-    verify_password,
+    get_url_safe_token_data,
+    get_url_safe_token_expiry,
 )
 
 from .schemas import (
@@ -66,9 +67,7 @@ async def register_user(
         status_code=status.HTTP_201_CREATED,
         content={
             "message": "User registered successfully",
-            "user": UserCreateResponseSchema(
-                **json.loads(user.model_dump_json())
-            ).model_dump(),
+            "user": UserCreateResponseSchema.model_validate(user),
         },
     )
 
@@ -130,9 +129,7 @@ async def activate_user(
         status_code=status.HTTP_200_OK,
         content={
             "message": "User activated successfully",
-            "user": UserCreateResponseSchema(
-                **json.loads(user.model_dump_json())
-            ).model_dump(),
+            "user": UserCreateResponseSchema.model_validate(user),
         },
     )
 
@@ -233,11 +230,13 @@ async def reset_password(
             content={"message": "Passwords do not match"},
         )
 
-    user.hashed_password = generate_password_hash(user_data.password)
+    user.hashed_password = await password_hasher.hash(user_data.password)
 
     await session.commit()
     await session.refresh(user)
 
+    await token_revocation.revoke_user_tokens(str(user.uid))
+
     send_email_task.delay(
         [user.email],
         "Password Reset Successfully",
@@ -264,7 +263,7 @@ async def login_user(
     access_token = request.cookies.get("access_token")
     if access_token:
         await token_blacklist_service.blacklist_token(
-            access_token, datetime.now(), session
+            access_token, get_url_safe_token_expiry(access_token), session
         )
 
     user = await user_service.get_user_by_email(user_data.email, session)
@@ -287,7 +286,7 @@ async def login_user(
             content={"message": "User not verified"},
         )
 
-    if not verify_password(user_data.password, user.hashed_password):
+    if not await password_hasher.verify(user_data.password, user.hashed_password):
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={"message": "Invalid password"},
@@ -297,6 +296,9 @@ async def login_user(
         {
             "user_uid": str(user.uid),
             "expires_at": (datetime.now() + timedelta(minutes=15)).timestamp(),
+            "generation": await token_revocation.get_generation(
+                str(user.uid), fresh=True
+            ),
         }
     )
 
@@ -304,9 +306,7 @@ async def login_user(
         status_code=status.HTTP_200_OK,
         content={
             "message": "User logged in successfully",
-            "user": UserCreateResponseSchema(
-                **json.loads(user.model_dump_json())
-            ).model_dump(),
+            "user": UserCreateResponseSchema.model_validate(user),
         },
     )
     response.set_cookie(
@@ -328,9 +328,13 @@ async def logout_user(
     access_token = request.cookies.get("access_token")
     if access_token:
         await token_blacklist_service.blacklist_token(
-            access_token, datetime.now(), session
+            access_token, get_url_safe_token_expiry(access_token), session
         )
 
+        user_uid = get_url_safe_token_data(access_token).get("user_uid")
+        if user_uid:
+            await token_revocation.revoke_user_tokens(user_uid)
+
     response = JSONResponse(
         status_code=status.HTTP_200_OK,
         content={"message": "User logged out successfully"},
@@ -384,6 +388,20 @@ async def get_logged_in_user(
         )
         return response
 
+    if await token_revocation.is_revoked(user_uid, data.get("generation", 0)):
+        response = JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"message": "Access token revoked"},
+        )
+        response.set_cookie(
+            key="access_token",
+            value="",
+            httponly=True,
+            secure=True,
+            expires=0,
+        )
+        return response
+
     user = await user_service.get_user_by_uid(user_uid, session)
 
     if not user:
@@ -396,8 +414,6 @@ async def get_logged_in_user(
         status_code=status.HTTP_200_OK,
         content={
             "message": "User found",
-            "user": UserCreateResponseSchema(
-                **json.loads(user.model_dump_json())
-            ).model_dump(),
+            "user": UserCreateResponseSchema.model_validate(user),
         },
     )
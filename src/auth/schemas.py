@@ -1,3 +1,6 @@
+import uuid
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -22,7 +25,7 @@ class UserCreateSchema(BaseModel):
 
 
 class UserCreateResponseSchema(BaseModel):
-    uid: str
+    uid: uuid.UUID
     username: str
     email: str
     first_name: str
@@ -30,10 +33,11 @@ class UserCreateResponseSchema(BaseModel):
     role: str
     is_verified: bool
     is_active: bool
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
     model_config = {
+        "from_attributes": True,
         "json_schema_extra": {
             "example": {
                 "uid": "123e4567-e89b-12d3-a456-426614174000",
@@ -47,7 +51,7 @@ class UserCreateResponseSchema(BaseModel):
                 "created_at": "2024-10-08T09:22:21.361119",
                 "updated_at": "2024-10-08T09:22:21.361119",
             }
-        }
+        },
     }
 
 
@@ -3,10 +3,17 @@ from datetime import datetime, timedelta
 from sqlalchemy import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from pkg.utils import generate_password_hash
+from pkg.hashing import password_hasher
+from pkg.pubsub import pubsub
 from src.profile.models import UserProfile
 
-from .models import PasswordResetLog, TokenBlacklist, User
+from .blacklist import (
+    TOKEN_BLACKLIST_CHANNEL,
+    token_blacklist_filter,
+    token_blacklist_store,
+    token_digest,
+)
+from .models import PasswordResetLog, User
 from .schemas import UserCreateSchema
 
 
@@ -19,7 +26,7 @@ class UserService:
             email=user_data.email,
             first_name=user_data.first_name,
             last_name=user_data.last_name,
-            hashed_password=generate_password_hash(user_data.password),
+            hashed_password=await password_hasher.hash(user_data.password),
         )
 
         session.add(user)
@@ -75,21 +82,20 @@ class TokenBlackListService:
     async def blacklist_token(
         self, token: str, expires_at: datetime, session: AsyncSession
     ) -> None:
-        token_blacklist = TokenBlacklist(token=token, expires_at=expires_at)
-        session.add(token_blacklist)
-        await session.commit()
+        await token_blacklist_store.add(token, expires_at, session)
+
+        digest = token_digest(token)
+        token_blacklist_filter.add(digest)
+        await pubsub.publish(TOKEN_BLACKLIST_CHANNEL, digest)
 
     async def check_token_blacklist(self, token: str, session: AsyncSession) -> bool:
-        result = await session.execute(
-            select(TokenBlacklist).where(TokenBlacklist.token == token)
-        )
-        token = result.scalars().first()
-        return True if token else False
+        if not token_blacklist_filter.might_contain(token_digest(token)):
+            return False
+
+        return await token_blacklist_store.contains(token, session)
 
     async def clear_expired_blacklisted_tokens(self, session: AsyncSession) -> None:
-        stmt = delete(TokenBlacklist).where(TokenBlacklist.expires_at < datetime.now())
-        await session.execute(stmt)
-        await session.commit()
+        await token_blacklist_store.clear_expired(session)
 
 
 class PasswordResetLogService:
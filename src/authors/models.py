@@ -2,11 +2,20 @@ import uuid
 from datetime import datetime
 
 import sqlalchemy.dialects.postgresql as pg
-from sqlmodel import Column, Field, SQLModel
+from sqlmodel import Column, Field, Index, SQLModel
 
 
 class Author(SQLModel, table=True):
     __tablename__ = "authors"
+    __table_args__ = (
+        Index("ix_authors_updated_at_uid", "updated_at", "uid"),
+        Index(
+            "ix_authors_pen_name_trgm",
+            "pen_name",
+            postgresql_using="gin",
+            postgresql_ops={"pen_name": "gin_trgm_ops"},
+        ),
+    )
 
     uid: uuid.UUID = Field(
         sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
@@ -31,3 +40,10 @@ class Author(SQLModel, table=True):
             pg.TIMESTAMP, nullable=False, default=datetime.now, onupdate=datetime.now
         )
     )
+
+
+class AuthorNationalityCount(SQLModel, table=True):
+    __tablename__ = "author_nationality_counts"
+
+    nationality: str = Field(sa_column=Column(pg.VARCHAR, primary_key=True))
+    count: int = Field(sa_column=Column(pg.INTEGER, nullable=False, default=0))
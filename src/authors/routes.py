@@ -1,21 +1,30 @@
-import json
-import os
+from itertools import chain
 
 from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from pkg.config import Config
 from pkg.db import get_session
-from pkg.tasks import upload_image_task
+from pkg.etag import etag_matches, make_etag, make_weak_etag, not_modified_response
+from pkg.projection import parse_fields, parse_page_size, project
+from pkg.response_cache import response_cache
+from pkg.responses import JSONResponse
+from pkg.storage import get_object_url
 from pkg.utils import get_current_user_uid
+from src.uploads.service import StoredImageService
 
-from .schemas import AuthorCreateSchema, AuthorResponseSchema
+from .schemas import AuthorBatchGetSchema, AuthorCreateSchema, AuthorResponseSchema
 from .service import AuthorService
 
 author_router = APIRouter()
 
 author_service = AuthorService()
+stored_image_service = StoredImageService()
+
+author_list_adapter = TypeAdapter(list[AuthorResponseSchema])
+
+AUTHOR_FIELDS = tuple(AuthorResponseSchema.model_fields)
 
 
 @author_router.post("/create", status_code=status.HTTP_201_CREATED)
@@ -46,9 +55,7 @@ async def create_author(
         status_code=status.HTTP_201_CREATED,
         content={
             "message": "Author created successfully",
-            "author": AuthorResponseSchema(
-                **json.loads(author.model_dump_json())
-            ).model_dump(),
+            "author": AuthorResponseSchema.model_validate(author),
         },
     )
 
@@ -75,9 +82,7 @@ async def update_author(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Author updated successfully",
-            "author": AuthorResponseSchema(
-                **json.loads(author.model_dump_json())
-            ).model_dump(),
+            "author": AuthorResponseSchema.model_validate(author),
         },
     )
 
@@ -107,49 +112,78 @@ async def update_author_profile_image(
             content={"message": "Profile image is required"},
         )
 
-    profile_image_content = await profile_image.read()
-    profile_image_file_extension = os.path.splitext(profile_image.filename)[1]
-    profile_image_file_name = (
-        f"author_profile_images/{author_uid}{profile_image_file_extension}"
-    )
-
-    upload_image_task.delay(
-        profile_image_content,
-        profile_image_file_name,
-        profile_image.content_type,
+    profile_image_file_name = await stored_image_service.store_image(
+        profile_image.file, profile_image.filename, profile_image.content_type, session
     )
+    await stored_image_service.release_image(author.profile_image, session)
 
-    file_url = f"http://{Config.DOMAIN}/minio/storage/{Config.MINIO_STORAGE_BUCKET}/{profile_image_file_name}"
+    file_url = get_object_url(profile_image_file_name)
     await author_service.update_author_profile_image(author, file_url, session)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Author profile image updated successfully",
-            "author": AuthorResponseSchema(
-                **json.loads(author.model_dump_json())
-            ).model_dump(),
+            "author": AuthorResponseSchema.model_validate(author),
         },
     )
 
 
 @author_router.get("/list", status_code=status.HTTP_200_OK)
 async def list_authors(request: Request, session: AsyncSession = Depends(get_session)):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
     page = int(request.query_params.get("page", 1))
+    limit = parse_page_size(request.query_params.get("limit"))
+    try:
+        fields = parse_fields(request.query_params.get("fields"), AUTHOR_FIELDS)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid fields"},
+        )
 
-    authors = await author_service.list_authors(page, session)
+    authors = await author_service.list_authors(page, session, limit, fields)
 
-    return JSONResponse(
+    book_counts = await author_service.get_book_counts(
+        [author.uid for author in authors], session
+    )
+    book_counts = {author.uid: book_counts.get(author.uid, 0) for author in authors}
+    nationality_counts = await author_service.get_nationality_counts(session)
+
+    etag = make_weak_etag(
+        chain(
+            (
+                (author.uid, author.updated_at, book_counts[author.uid])
+                for author in authors
+            ),
+            nationality_counts.items(),
+        )
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    response = JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Authors retrieved successfully",
-            "authors": [
-                AuthorResponseSchema(
-                    **json.loads(author.model_dump_json())
-                ).model_dump()
-                for author in authors
-            ],
+            "authors": (
+                author_list_adapter.validate_python(authors)
+                if fields is None
+                else project(authors, fields)
+            ),
+            "book_counts": book_counts,
+            "nationality_counts": nationality_counts,
         },
+        headers={"ETag": etag},
+    )
+
+    return await response_cache.set_response(
+        request,
+        response,
+        ["authors", "books", *(f"author:{author.uid}" for author in authors)],
     )
 
 
@@ -157,30 +191,77 @@ async def list_authors(request: Request, session: AsyncSession = Depends(get_ses
 async def list_authors_by_nationality(
     request: Request, nationality: str, session: AsyncSession = Depends(get_session)
 ):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
     page = int(request.query_params.get("page", 1))
+    limit = parse_page_size(request.query_params.get("limit"))
+    try:
+        fields = parse_fields(request.query_params.get("fields"), AUTHOR_FIELDS)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid fields"},
+        )
 
     authors = await author_service.list_authors_by_nationality(
-        nationality, page, session
+        nationality, page, session, limit, fields
     )
 
-    return JSONResponse(
+    book_counts = await author_service.get_book_counts(
+        [author.uid for author in authors], session
+    )
+    book_counts = {author.uid: book_counts.get(author.uid, 0) for author in authors}
+    nationality_counts = await author_service.get_nationality_counts(session)
+
+    etag = make_weak_etag(
+        chain(
+            (
+                (author.uid, author.updated_at, book_counts[author.uid])
+                for author in authors
+            ),
+            nationality_counts.items(),
+        )
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    response = JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Authors retrieved successfully",
-            "authors": [
-                AuthorResponseSchema(
-                    **json.loads(author.model_dump_json())
-                ).model_dump()
-                for author in authors
-            ],
+            "authors": (
+                author_list_adapter.validate_python(authors)
+                if fields is None
+                else project(authors, fields)
+            ),
+            "book_counts": book_counts,
+            "nationality_counts": nationality_counts,
         },
+        headers={"ETag": etag},
+    )
+
+    return await response_cache.set_response(
+        request,
+        response,
+        ["authors", "books", *(f"author:{author.uid}" for author in authors)],
     )
 
 
 @author_router.get("/get/pen_name/{pen_name}", status_code=status.HTTP_200_OK)
 async def get_author_by_pen_name(
-    pen_name: str, session: AsyncSession = Depends(get_session)
+    request: Request, pen_name: str, session: AsyncSession = Depends(get_session)
 ):
+    if request.headers.get("if-none-match"):
+        author_version = await author_service.get_author_version_by_pen_name(
+            pen_name, session
+        )
+        if author_version:
+            etag = make_etag(*author_version)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
     author = await author_service.get_author_by_pen_name(pen_name, session)
 
     if not author:
@@ -189,21 +270,61 @@ async def get_author_by_pen_name(
             content={"message": "Author not found"},
         )
 
+    etag = make_etag(author.uid, author.updated_at)
+
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Author found",
-            "author": AuthorResponseSchema(
-                **json.loads(author.model_dump_json())
-            ).model_dump(),
+            "author": AuthorResponseSchema.model_validate(author),
+        },
+        headers={"ETag": etag},
+    )
+
+
+@author_router.post("/get/batch", status_code=status.HTTP_200_OK)
+async def get_authors_by_uids(
+    batch_data: AuthorBatchGetSchema, session: AsyncSession = Depends(get_session)
+):
+    uids = list(dict.fromkeys(batch_data.uids))
+    if len(uids) > Config.BATCH_GET_MAX_SIZE:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": f"At most {Config.BATCH_GET_MAX_SIZE} uids are allowed"
+            },
+        )
+
+    authors = await author_service.get_authors_by_uids(uids, session)
+    found_uids = {author.uid for author in authors}
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Authors found",
+            "authors": author_list_adapter.validate_python(authors),
+            "missing": [uid for uid in uids if uid not in found_uids],
         },
     )
 
 
 @author_router.get("/get/uid/{author_uid}", status_code=status.HTTP_200_OK)
 async def get_author_by_uid(
-    author_uid: str, session: AsyncSession = Depends(get_session)
+    request: Request, author_uid: str, session: AsyncSession = Depends(get_session)
 ):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
+    if request.headers.get("if-none-match"):
+        author_version = await author_service.get_author_version_by_uid(
+            author_uid, session
+        )
+        if author_version:
+            etag = make_etag(*author_version)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
     author = await author_service.get_author_by_uid(author_uid, session)
 
     if not author:
@@ -212,12 +333,17 @@ async def get_author_by_uid(
             content={"message": "Author not found"},
         )
 
-    return JSONResponse(
+    etag = make_etag(author.uid, author.updated_at)
+
+    response = JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Author found",
-            "author": AuthorResponseSchema(
-                **json.loads(author.model_dump_json())
-            ).model_dump(),
+            "author": AuthorResponseSchema.model_validate(author),
         },
+        headers={"ETag": etag},
+    )
+
+    return await response_cache.set_response(
+        request, response, [f"author:{author.uid}"]
     )
@@ -1,3 +1,6 @@
+import uuid
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -26,18 +29,36 @@ class AuthorCreateSchema(BaseModel):
     }
 
 
+class AuthorBatchGetSchema(BaseModel):
+    uids: list[uuid.UUID] = Field(
+        min_length=1, description="The uids of the authors to fetch, in order."
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "uids": [
+                    "123e4567-e89b-12d3-a456-426614174000",
+                    "123e4567-e89b-12d3-a456-426614174001",
+                ]
+            }
+        }
+    }
+
+
 class AuthorResponseSchema(BaseModel):
-    uid: str
+    uid: uuid.UUID
     first_name: str
     last_name: str
     pen_name: str
     nationality: str
     biography: str
     profile_image: str
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
     model_config = {
+        "from_attributes": True,
         "json_schema_extra": {
             "example": {
                 "uid": "123e4567-e89b-12d3-a456-426614174000",
@@ -50,5 +71,5 @@ class AuthorResponseSchema(BaseModel):
                 "created_at": "2021-07-01T12:00:00",
                 "updated_at": "2021-07-01T12:00:00",
             }
-        }
+        },
     }
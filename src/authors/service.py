@@ -1,7 +1,14 @@
-from sqlalchemy import select
+from typing import Optional
+
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import any_, cast, literal_column, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .models import Author
+from pkg.projection import DEFAULT_PAGE_SIZE, load_fields
+from pkg.response_cache import response_cache
+from src.books.models import BookFacetCount
+
+from .models import Author, AuthorNationalityCount
 
 
 class AuthorService:
@@ -27,17 +34,23 @@ class AuthorService:
         session.add(author)
         await session.commit()
         await session.refresh(author)
+        await response_cache.invalidate("authors")
 
         return author
 
     async def update_author(
         self, author: Author, author_data: dict, session: AsyncSession
     ):
+        cache_tags = [f"author:{author.uid}"]
+        if author_data.get("nationality", author.nationality) != author.nationality:
+            cache_tags.append("authors")
+
         for field, value in author_data.items():
             setattr(author, field, value)
 
         await session.commit()
         await session.refresh(author)
+        await response_cache.invalidate(*cache_tags)
 
         return author
 
@@ -48,6 +61,7 @@ class AuthorService:
 
         await session.commit()
         await session.refresh(author)
+        await response_cache.invalidate(f"author:{author.uid}")
 
         return author
 
@@ -56,6 +70,76 @@ class AuthorService:
         author = result.scalars().first()
         return author
 
+    async def get_authors_by_uids(self, uids: list, session: AsyncSession):
+        if not uids:
+            return []
+
+        result = await session.execute(
+            select(Author).where(Author.uid == any_(cast(uids, pg.ARRAY(pg.UUID))))
+        )
+        authors = {author.uid: author for author in result.scalars().all()}
+        return [authors[uid] for uid in uids if uid in authors]
+
+    async def get_author_full_names_by_uids(self, uids: list, session: AsyncSession):
+        if not uids:
+            return {}
+
+        full_name = Author.first_name + literal_column("' '") + Author.last_name
+        result = await session.execute(
+            select(Author.uid, full_name.label("full_name")).where(
+                Author.uid == any_(cast(uids, pg.ARRAY(pg.UUID)))
+            )
+        )
+        return {row.uid: row.full_name for row in result.all()}
+
+    async def get_author_uids_by_full_names(self, names: list, session: AsyncSession):
+        if not names:
+            return {}
+
+        full_name = (
+            Author.first_name + literal_column("' '") + Author.last_name
+        ).self_group()
+        result = await session.execute(
+            select(full_name.label("full_name"), Author.uid).where(
+                full_name == any_(cast(names, pg.ARRAY(pg.VARCHAR)))
+            )
+        )
+        return {row.full_name: row.uid for row in result.all()}
+
+    async def get_book_counts(self, uids: list, session: AsyncSession):
+        if not uids:
+            return {}
+
+        result = await session.execute(
+            select(BookFacetCount.uid, BookFacetCount.count).where(
+                BookFacetCount.facet == "author",
+                BookFacetCount.uid == any_(cast(uids, pg.ARRAY(pg.UUID))),
+            )
+        )
+        return {row.uid: row.count for row in result.all()}
+
+    async def get_nationality_counts(self, session: AsyncSession):
+        result = await session.execute(
+            select(AuthorNationalityCount.nationality, AuthorNationalityCount.count)
+            .where(AuthorNationalityCount.count > 0)
+            .order_by(AuthorNationalityCount.nationality)
+        )
+        return {row.nationality: row.count for row in result.all()}
+
+    async def get_author_version_by_uid(self, uid: str, session: AsyncSession):
+        result = await session.execute(
+            select(Author.uid, Author.updated_at).where(Author.uid == uid)
+        )
+        return result.first()
+
+    async def get_author_version_by_pen_name(
+        self, pen_name: str, session: AsyncSession
+    ):
+        result = await session.execute(
+            select(Author.uid, Author.updated_at).where(Author.pen_name == pen_name)
+        )
+        return result.first()
+
     async def get_author_by_pen_name(self, pen_name: str, session: AsyncSession):
         result = await session.execute(
             select(Author).where(Author.pen_name == pen_name)
@@ -75,18 +159,35 @@ class AuthorService:
         return author
 
     async def list_authors_by_nationality(
-        self, nationality: str, page: int, session: AsyncSession
+        self,
+        nationality: str,
+        page: int,
+        session: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
     ):
         result = await session.execute(
             select(Author)
             .where(Author.nationality == nationality)
-            .offset((page - 1) * 10)
-            .limit(10)
+            .options(*load_fields(Author, fields, "uid", "updated_at"))
+            .offset((page - 1) * limit)
+            .limit(limit)
         )
         authors = result.scalars().all()
         return authors
 
-    async def list_authors(self, page: int, session: AsyncSession):
-        result = await session.execute(select(Author).offset((page - 1) * 10).limit(10))
+    async def list_authors(
+        self,
+        page: int,
+        session: AsyncSession,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
+    ):
+        result = await session.execute(
+            select(Author)
+            .options(*load_fields(Author, fields, "uid", "updated_at"))
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
         authors = result.scalars().all()
         return authors
@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+from typing import Optional
+
+from sqlalchemy import select
+
+from pkg.db import get_session
+from pkg.pubsub import pubsub
+
+from .models import BookCategory, BookGenre
+
+
+class ReferenceCache:
+    def __init__(self, model, name_field: str, channel: str):
+        self.model = model
+        self.name_field = name_field
+        self.channel = channel
+        self.items: Optional[list] = None
+        self.by_uid: dict = {}
+        self.by_name: dict = {}
+        self.version = 0
+        self.lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        async with self.lock:
+            if self.items is not None:
+                return
+
+            version = self.version
+            async for session in get_session():
+                result = await session.execute(
+                    select(self.model).order_by(self.model.created_at, self.model.uid)
+                )
+                items = result.scalars().all()
+
+            # An invalidation that arrived mid-load means these rows may
+            # already be stale, so leave the cache empty and let it reload.
+            if version == self.version:
+                self.by_uid = {item.uid: item for item in items}
+                self.by_name = {getattr(item, self.name_field): item for item in items}
+                self.items = items
+
+    async def get_items(self) -> list:
+        while self.items is None:
+            await self.load()
+
+        return self.items
+
+    async def get_by_uid(self, uid: str):
+        try:
+            uid = uuid.UUID(str(uid))
+        except ValueError:
+            return None
+
+        await self.get_items()
+        return self.by_uid.get(uid)
+
+    async def get_by_name(self, name: str):
+        await self.get_items()
+        return self.by_name.get(name)
+
+    def invalidate(self, message: Optional[str] = None) -> None:
+        self.version += 1
+        self.items = None
+
+    async def publish_invalidation(self) -> None:
+        self.invalidate()
+        await pubsub.publish(self.channel, "")
+
+    async def warm(self) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            print(f"Error warming {self.model.__tablename__} cache: {e}")
+
+
+book_category_cache = ReferenceCache(BookCategory, "category", "book_categories")
+book_genre_cache = ReferenceCache(BookGenre, "genre", "book_genres")
+
+for reference_cache in (book_category_cache, book_genre_cache):
+    pubsub.subscribe(reference_cache.channel, reference_cache.invalidate)
+    pubsub.on_reconnect(reference_cache.invalidate)
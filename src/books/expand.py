@@ -0,0 +1,88 @@
+from typing import Iterable, Iterator, Optional
+
+from pydantic import TypeAdapter
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.authors.schemas import AuthorResponseSchema
+from src.authors.service import AuthorService
+
+from .cache import book_category_cache, book_genre_cache
+from .models import Book
+from .schemas import BookCategoryResponseSchema, BookGenreResponseSchema
+
+BOOK_EXPANSIONS = ("authors", "categories", "genres")
+
+expanded_adapters = {
+    "authors": TypeAdapter(list[AuthorResponseSchema]),
+    "categories": TypeAdapter(list[BookCategoryResponseSchema]),
+    "genres": TypeAdapter(list[BookGenreResponseSchema]),
+}
+expanded_cache_tags = {
+    "authors": "author",
+    "categories": "book_category",
+    "genres": "book_genre",
+}
+
+
+def parse_book_expand(value: Optional[str]) -> tuple[str, ...]:
+    if not value:
+        return ()
+
+    expand = tuple(dict.fromkeys(filter(None, map(str.strip, value.split(",")))))
+    if any(field not in BOOK_EXPANSIONS for field in expand):
+        raise ValueError("Invalid expand")
+
+    return expand
+
+
+def collect_uids(books: Iterable[Book], field: str) -> list:
+    return list(dict.fromkeys(uid for book in books for uid in getattr(book, field)))
+
+
+class BookExpansion:
+    def __init__(self, included: dict[str, list]):
+        self.included = included
+
+    def versions(self) -> Iterator[tuple]:
+        for items in self.included.values():
+            for item in items:
+                yield item.uid, item.updated_at
+
+    def cache_tags(self) -> Iterator[str]:
+        for field, items in self.included.items():
+            for item in items:
+                yield f"{expanded_cache_tags[field]}:{item.uid}"
+
+    def content(self) -> dict:
+        return {
+            field: expanded_adapters[field].validate_python(items)
+            for field, items in self.included.items()
+        }
+
+
+class BookExpander:
+    def __init__(self):
+        self.author_service = AuthorService()
+
+    async def expand_books(
+        self, books: list[Book], expand: tuple[str, ...], session: AsyncSession
+    ) -> BookExpansion:
+        included = {}
+
+        if "authors" in expand:
+            included["authors"] = await self.author_service.get_authors_by_uids(
+                collect_uids(books, "authors"), session
+            )
+
+        for field, reference_cache in (
+            ("categories", book_category_cache),
+            ("genres", book_genre_cache),
+        ):
+            if field in expand:
+                items = [
+                    await reference_cache.get_by_uid(uid)
+                    for uid in collect_uids(books, field)
+                ]
+                included[field] = [item for item in items if item is not None]
+
+        return BookExpansion(included)
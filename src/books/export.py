@@ -0,0 +1,107 @@
+import csv
+import io
+from typing import AsyncIterator
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.authors.service import AuthorService
+
+from .cache import book_category_cache, book_genre_cache
+from .importer import BOOK_IMPORT_LIST_FIELDS, BOOK_IMPORT_LIST_SEPARATOR
+from .models import Book
+from .schemas import BookExportSchema
+
+BOOK_EXPORT_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+BOOK_EXPORT_CHUNK_ROWS = 500
+BOOK_EXPORT_CSV_COLUMNS = (
+    "uid",
+    "title",
+    "description",
+    "isbn",
+    "published_date",
+    "page_count",
+    "authors",
+    "categories",
+    "genres",
+    "images",
+    "created_at",
+    "updated_at",
+)
+
+
+async def export_books_ndjson(books: AsyncIterator[Book]) -> AsyncIterator[str]:
+    lines = []
+    async for book in books:
+        lines.append(BookExportSchema.model_validate(book).model_dump_json())
+        if len(lines) >= BOOK_EXPORT_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def get_reference_names(cache, uids: list, name_field: str) -> list[str]:
+    names = []
+    for uid in uids:
+        item = await cache.get_by_uid(uid)
+        if item is not None:
+            names.append(getattr(item, name_field))
+
+    return names
+
+
+async def write_books_csv(writer, books: list[Book], session: AsyncSession) -> None:
+    # The list columns hold names rather than uids, in the format the importer
+    # reads, so an exported CSV can be fed back into /books/import. Names are
+    # looked up on the export's own session between cursor fetches.
+    author_names = await AuthorService().get_author_full_names_by_uids(
+        list({uid for book in books for uid in book.authors}), session
+    )
+
+    for book in books:
+        data = BookExportSchema.model_validate(book).model_dump(mode="json")
+        data["authors"] = [
+            author_names[uid] for uid in book.authors if uid in author_names
+        ]
+        data["categories"] = await get_reference_names(
+            book_category_cache, book.categories, "category"
+        )
+        data["genres"] = await get_reference_names(
+            book_genre_cache, book.genres, "genre"
+        )
+        for field in (*BOOK_IMPORT_LIST_FIELDS, "images"):
+            data[field] = BOOK_IMPORT_LIST_SEPARATOR.join(data[field])
+        writer.writerow([data[column] for column in BOOK_EXPORT_CSV_COLUMNS])
+
+
+async def export_books_csv(
+    books: AsyncIterator[Book], session: AsyncSession
+) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(BOOK_EXPORT_CSV_COLUMNS)
+
+    chunk = []
+    async for book in books:
+        chunk.append(book)
+        if len(chunk) >= BOOK_EXPORT_CHUNK_ROWS:
+            await write_books_csv(writer, chunk, session)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            chunk = []
+
+    if chunk:
+        await write_books_csv(writer, chunk, session)
+
+    yield buffer.getvalue()
+
+
+def export_books(
+    books: AsyncIterator[Book], format: str, session: AsyncSession
+) -> AsyncIterator[str]:
+    if format == "csv":
+        return export_books_csv(books, session)
+
+    return export_books_ndjson(books)
@@ -0,0 +1,374 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import uuid
+from datetime import date, datetime
+from typing import Awaitable, Callable, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pkg.db import async_session_maker, engine
+from pkg.redis import redis_client
+from pkg.response_cache import response_cache
+from src.authors.service import AuthorService
+
+from .schemas import BookCreateSchema
+from .service import BookCategoryService, BookGenreService, BookService
+
+BOOK_IMPORT_FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv"}
+BOOK_IMPORT_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+BOOK_IMPORT_BATCH_SIZE = 1000
+BOOK_IMPORT_MAX_ERRORS = 1000
+BOOK_IMPORT_LIST_SEPARATOR = "|"
+BOOK_IMPORT_LIST_FIELDS = ("authors", "categories", "genres")
+BOOK_IMPORT_COLUMNS = (
+    "uid",
+    "title",
+    "description",
+    "isbn",
+    "published_date",
+    "page_count",
+    "authors",
+    "categories",
+    "genres",
+    "created_at",
+    "updated_at",
+)
+
+
+def read_ndjson_rows(lines: Iterable[str]) -> Iterator[tuple[int, Optional[dict]]]:
+    for row_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+
+        yield row_number, data if isinstance(data, dict) else None
+
+
+def read_csv_rows(lines: Iterable[str]) -> Iterator[tuple[int, Optional[dict]]]:
+    reader = csv.DictReader(lines)
+    for data in reader:
+        if None in data:
+            yield reader.line_num, None
+            continue
+
+        for field in BOOK_IMPORT_LIST_FIELDS:
+            if data.get(field) is not None:
+                data[field] = [
+                    value.strip()
+                    for value in data[field].split(BOOK_IMPORT_LIST_SEPARATOR)
+                    if value.strip()
+                ]
+
+        yield reader.line_num, data
+
+
+def read_book_import_rows(
+    lines: Iterable[str], format: str
+) -> Iterator[tuple[int, Optional[dict]]]:
+    if format == "csv":
+        return read_csv_rows(lines)
+
+    return read_ndjson_rows(lines)
+
+
+def format_validation_errors(error: ValidationError) -> list[str]:
+    return [
+        f"{'.'.join(map(str, detail['loc']))}: {detail['msg']}"
+        for detail in error.errors()
+    ]
+
+
+class BookImporter:
+    def __init__(
+        self,
+        batch_size: int = BOOK_IMPORT_BATCH_SIZE,
+        max_errors: int = BOOK_IMPORT_MAX_ERRORS,
+    ):
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.author_service = AuthorService()
+        self.book_category_service = BookCategoryService()
+        self.book_genre_service = BookGenreService()
+        self.book_service = BookService()
+
+    def add_error(
+        self, progress: dict, row_number: int, isbn: Optional[str], errors: list
+    ) -> None:
+        if len(progress["errors"]) < self.max_errors:
+            progress["errors"].append(
+                {"row": row_number, "isbn": isbn, "errors": errors}
+            )
+
+    async def import_books(
+        self,
+        rows: Iterable[tuple[int, Optional[dict]]],
+        session: AsyncSession,
+        on_progress: Optional[Callable[[dict], Awaitable[None]]] = None,
+    ) -> dict:
+        progress = {
+            "total_rows": 0,
+            "imported_rows": 0,
+            "skipped_rows": 0,
+            "failed_rows": 0,
+            "errors": [],
+        }
+        seen_isbns = set()
+        seen_titles = set()
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) < self.batch_size:
+                continue
+
+            await self.import_batch(batch, progress, seen_isbns, seen_titles, session)
+            batch = []
+            if on_progress is not None:
+                await on_progress(progress)
+
+        if batch:
+            await self.import_batch(batch, progress, seen_isbns, seen_titles, session)
+            if on_progress is not None:
+                await on_progress(progress)
+
+        return progress
+
+    def validate_rows(
+        self,
+        batch: list,
+        progress: dict,
+        seen_isbns: set,
+        seen_titles: set,
+    ) -> list:
+        books = []
+        for row_number, data in batch:
+            progress["total_rows"] += 1
+
+            if data is None:
+                progress["failed_rows"] += 1
+                self.add_error(progress, row_number, None, ["Malformed row"])
+                continue
+
+            try:
+                book_data = BookCreateSchema.model_validate(data)
+                published_date = date.fromisoformat(book_data.published_date)
+            except ValidationError as e:
+                progress["failed_rows"] += 1
+                self.add_error(
+                    progress,
+                    row_number,
+                    data.get("isbn"),
+                    format_validation_errors(e),
+                )
+                continue
+            except ValueError:
+                progress["failed_rows"] += 1
+                self.add_error(
+                    progress,
+                    row_number,
+                    data.get("isbn"),
+                    ["published_date: Invalid date, expected YYYY-MM-DD"],
+                )
+                continue
+
+            if book_data.isbn in seen_isbns or book_data.title in seen_titles:
+                progress["skipped_rows"] += 1
+                self.add_error(
+                    progress, row_number, book_data.isbn, ["Duplicate book in import"]
+                )
+                continue
+
+            seen_isbns.add(book_data.isbn)
+            seen_titles.add(book_data.title)
+            books.append((row_number, book_data, published_date))
+
+        return books
+
+    async def resolve_uids(
+        self,
+        books: list,
+        field: str,
+        lookup: Callable[[list, AsyncSession], Awaitable[dict]],
+        session: AsyncSession,
+    ) -> dict:
+        names = list(
+            {name for _, book_data, _ in books for name in getattr(book_data, field)}
+        )
+        return await lookup(names, session)
+
+    async def import_batch(
+        self,
+        batch: list,
+        progress: dict,
+        seen_isbns: set,
+        seen_titles: set,
+        session: AsyncSession,
+    ) -> None:
+        books = self.validate_rows(batch, progress, seen_isbns, seen_titles)
+        if not books:
+            return
+
+        existing_isbns, existing_titles = (
+            await self.book_service.get_existing_book_keys(
+                [book_data.isbn for _, book_data, _ in books],
+                [book_data.title for _, book_data, _ in books],
+                session,
+            )
+        )
+        # Categories and genres are resolved against the database rather than
+        # the in-process caches, which are never invalidated in a Celery worker.
+        author_uids = await self.resolve_uids(
+            books,
+            "authors",
+            self.author_service.get_author_uids_by_full_names,
+            session,
+        )
+        category_uids = await self.resolve_uids(
+            books,
+            "categories",
+            self.book_category_service.get_book_category_uids_by_names,
+            session,
+        )
+        genre_uids = await self.resolve_uids(
+            books,
+            "genres",
+            self.book_genre_service.get_book_genre_uids_by_names,
+            session,
+        )
+
+        now = datetime.now()
+        records = {}
+        for row_number, book_data, published_date in books:
+            if book_data.isbn in existing_isbns or book_data.title in existing_titles:
+                progress["skipped_rows"] += 1
+                self.add_error(
+                    progress, row_number, book_data.isbn, ["Book already exists"]
+                )
+                continue
+
+            errors = []
+            authors = []
+            for name in book_data.authors:
+                if author_uids.get(name) is None:
+                    errors.append(f"Unknown author: {name}")
+                else:
+                    authors.append(author_uids[name])
+
+            categories = []
+            for name in book_data.categories:
+                if category_uids.get(name) is None:
+                    errors.append(f"Unknown category: {name}")
+                else:
+                    categories.append(category_uids[name])
+
+            genres = []
+            for name in book_data.genres:
+                if genre_uids.get(name) is None:
+                    errors.append(f"Unknown genre: {name}")
+                else:
+                    genres.append(genre_uids[name])
+
+            if errors:
+                progress["failed_rows"] += 1
+                self.add_error(progress, row_number, book_data.isbn, errors)
+                continue
+
+            records[book_data.isbn] = (
+                row_number,
+                (
+                    uuid.uuid4(),
+                    book_data.title,
+                    book_data.description,
+                    book_data.isbn,
+                    published_date,
+                    book_data.page_count,
+                    authors,
+                    categories,
+                    genres,
+                    now,
+                    now,
+                ),
+            )
+
+        if not records:
+            await session.rollback()
+            return
+
+        imported_isbns = await self.copy_books(
+            [record for _, record in records.values()], session
+        )
+        await session.commit()
+
+        for isbn, (row_number, _) in records.items():
+            if isbn in imported_isbns:
+                progress["imported_rows"] += 1
+            else:
+                progress["skipped_rows"] += 1
+                self.add_error(progress, row_number, isbn, ["Book already exists"])
+
+        if imported_isbns:
+            await response_cache.invalidate("books")
+
+    async def copy_books(self, records: list, session: AsyncSession) -> set:
+        # The lookups above already opened the session's transaction, so the
+        # staging table lives until the batch is committed.
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        columns = ", ".join(BOOK_IMPORT_COLUMNS)
+        await driver_connection.execute(
+            f"CREATE TEMP TABLE book_import ON COMMIT DROP AS "
+            f"SELECT {columns} FROM books WITH NO DATA"
+        )
+        await driver_connection.copy_records_to_table(
+            "book_import", records=records, columns=BOOK_IMPORT_COLUMNS
+        )
+        rows = await driver_connection.fetch(
+            f"INSERT INTO books ({columns}) SELECT {columns} FROM book_import "
+            f"ON CONFLICT (isbn) DO NOTHING RETURNING isbn"
+        )
+        return {row["isbn"] for row in rows}
+
+
+async def import_books_from_file(path: str, format: str) -> dict:
+    async def print_progress(progress: dict) -> None:
+        print(
+            f"{progress['total_rows']} rows read, "
+            f"{progress['imported_rows']} imported, "
+            f"{progress['skipped_rows']} skipped, "
+            f"{progress['failed_rows']} failed"
+        )
+
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as file:
+            async with async_session_maker() as session:
+                return await BookImporter().import_books(
+                    read_book_import_rows(file, format), session, print_progress
+                )
+    finally:
+        await engine.dispose()
+        await redis_client.connection_pool.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import books from NDJSON or CSV.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(BOOK_IMPORT_CONTENT_TYPES))
+    args = parser.parse_args()
+
+    format = args.format or BOOK_IMPORT_FORMATS.get(
+        os.path.splitext(args.path)[1].lower(), "ndjson"
+    )
+
+    progress = asyncio.run(import_books_from_file(args.path, format))
+    for error in progress["errors"]:
+        print(f"Row {error['row']} ({error['isbn']}): {'; '.join(error['errors'])}")
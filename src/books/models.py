@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
+from typing import Optional
 
 import sqlalchemy.dialects.postgresql as pg
-from sqlmodel import Column, Field, SQLModel
+from sqlmodel import Column, Field, Index, SQLModel
 
 
 class BookCategory(SQLModel, table=True):
@@ -49,6 +50,19 @@ class BookGenre(SQLModel, table=True):
 
 class Book(SQLModel, table=True):
     __tablename__ = "books"
+    __table_args__ = (
+        Index("ix_books_created_at_uid", "created_at", "uid"),
+        Index("ix_books_updated_at_uid", "updated_at", "uid"),
+        Index("ix_books_authors", "authors", postgresql_using="gin"),
+        Index("ix_books_categories", "categories", postgresql_using="gin"),
+        Index("ix_books_genres", "genres", postgresql_using="gin"),
+        Index(
+            "ix_books_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     uid: uuid.UUID = Field(
         sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
@@ -65,4 +79,55 @@ class Book(SQLModel, table=True):
         sa_column=Column(pg.ARRAY(pg.UUID), nullable=False)
     )
     genres: list[uuid.UUID] = Field(sa_column=Column(pg.ARRAY(pg.UUID), nullable=False))
-    images: list[uuid.UUID] = Field(sa_column=Column(pg.ARRAY(pg.UUID), nullable=False))
+    images: list[str] = Field(
+        sa_column=Column(
+            pg.ARRAY(pg.VARCHAR), nullable=False, default=list, server_default="{}"
+        )
+    )
+    image_variants: dict = Field(
+        sa_column=Column(pg.JSONB, nullable=False, default=dict, server_default="{}")
+    )
+    created_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.now)
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            pg.TIMESTAMP, nullable=False, default=datetime.now, onupdate=datetime.now
+        )
+    )
+
+
+class BookImport(SQLModel, table=True):
+    __tablename__ = "book_imports"
+
+    uid: uuid.UUID = Field(
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+    )
+    user_uid: uuid.UUID = Field(sa_column=Column(pg.UUID, nullable=False))
+    object_name: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
+    format: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
+    status: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, default="queued"))
+    total_rows: int = Field(sa_column=Column(pg.INTEGER, nullable=False, default=0))
+    imported_rows: int = Field(sa_column=Column(pg.INTEGER, nullable=False, default=0))
+    skipped_rows: int = Field(sa_column=Column(pg.INTEGER, nullable=False, default=0))
+    failed_rows: int = Field(sa_column=Column(pg.INTEGER, nullable=False, default=0))
+    errors: list = Field(
+        sa_column=Column(pg.JSONB, nullable=False, default=list, server_default="[]")
+    )
+    error: Optional[str] = Field(sa_column=Column(pg.TEXT, nullable=True))
+    created_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.now)
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            pg.TIMESTAMP, nullable=False, default=datetime.now, onupdate=datetime.now
+        )
+    )
+
+
+class BookFacetCount(SQLModel, table=True):
+    __tablename__ = "book_facet_counts"
+
+    facet: str = Field(sa_column=Column(pg.VARCHAR, primary_key=True))
+    uid: uuid.UUID = Field(sa_column=Column(pg.UUID, primary_key=True))
+    count: int = Field(sa_column=Column(pg.INTEGER, nullable=False, default=0))
@@ -1,24 +1,46 @@
-import json
 import os
+import uuid
+from datetime import date, datetime
+from itertools import chain
+from typing import Callable, Optional
 
 from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from pkg.config import Config
 from pkg.db import get_session
-from pkg.tasks import upload_image_task
+from pkg.etag import etag_matches, make_etag, make_weak_etag, not_modified_response
+from pkg.projection import parse_fields, parse_page_size, project
+from pkg.response_cache import response_cache
+from pkg.responses import JSONResponse
+from pkg.storage import get_object_url, upload_fileobj
 from pkg.utils import get_current_user_uid
+from src.uploads.schemas import UploadJobResponseSchema
+from src.uploads.service import StoredImageService, UploadJobService
 
+from .expand import BookExpander, parse_book_expand
+from .export import BOOK_EXPORT_CONTENT_TYPES, export_books
+from .importer import BOOK_IMPORT_CONTENT_TYPES, BOOK_IMPORT_FORMATS
 from .schemas import (
+    AutocompleteSuggestionSchema,
+    BookBatchGetSchema,
     BookCategoryCreateSchema,
     BookCategoryResponseSchema,
     BookCreateSchema,
     BookGenreCreateSchema,
     BookGenreResponseSchema,
+    BookImportResponseSchema,
     BookResponseSchema,
 )
-from .service import BookCategoryService, BookGenreService, BookService
+from .service import (
+    BookCategoryService,
+    BookGenreService,
+    BookImportService,
+    BookService,
+)
+from .tasks import generate_book_image_variants_task, import_books_task
 
 book_category_router = APIRouter()
 book_genre_router = APIRouter()
@@ -27,6 +49,39 @@ book_router = APIRouter()
 book_category_service = BookCategoryService()
 book_genre_service = BookGenreService()
 book_service = BookService()
+book_expander = BookExpander()
+book_import_service = BookImportService()
+stored_image_service = StoredImageService()
+upload_job_service = UploadJobService()
+
+book_category_list_adapter = TypeAdapter(list[BookCategoryResponseSchema])
+book_genre_list_adapter = TypeAdapter(list[BookGenreResponseSchema])
+book_list_adapter = TypeAdapter(list[BookResponseSchema])
+autocomplete_suggestion_list_adapter = TypeAdapter(list[AutocompleteSuggestionSchema])
+
+BOOK_FIELDS = tuple(BookResponseSchema.model_fields)
+
+
+def load_book_fields(fields: Optional[tuple], expand: tuple) -> Optional[tuple]:
+    return fields and (*fields, *expand)
+
+
+def parse_uid_list(value: Optional[str]) -> list[str]:
+    if not value:
+        return []
+
+    return [str(uuid.UUID(uid.strip())) for uid in value.split(",") if uid.strip()]
+
+
+def parse_optional(value: Optional[str], parser: Callable):
+    return parser(value) if value else None
+
+
+def serialize_books(books: list, fields: Optional[tuple]):
+    if fields is None:
+        return book_list_adapter.validate_python(books)
+
+    return project(books, fields)
 
 
 @book_category_router.post("/create", status_code=status.HTTP_201_CREATED)
@@ -52,9 +107,7 @@ async def create_book_category(
         status_code=status.HTTP_201_CREATED,
         content={
             "message": "Book category created successfully",
-            "book_category": BookCategoryResponseSchema(
-                **json.loads(book_category.model_dump_json())
-            ).model_dump(),
+            "book_category": BookCategoryResponseSchema.model_validate(book_category),
         },
     )
 
@@ -90,9 +143,7 @@ async def update_book_category(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Book category updated successfully",
-            "book_category": BookCategoryResponseSchema(
-                **json.loads(book_category.model_dump_json())
-            ).model_dump(),
+            "book_category": BookCategoryResponseSchema.model_validate(book_category),
         },
     )
 
@@ -102,26 +153,42 @@ async def list_book_categories(
     request: Request, session: AsyncSession = Depends(get_session)
 ):
     page = int(request.query_params.get("page", 1))
+    limit = parse_page_size(request.query_params.get("limit"))
 
-    book_categories = await book_category_service.list_book_categories(page, session)
+    book_categories = await book_category_service.list_book_categories(
+        page, session, limit
+    )
+    book_counts = await book_category_service.get_book_counts(
+        [book_category.uid for book_category in book_categories], session
+    )
+    book_counts = {
+        book_category.uid: book_counts.get(book_category.uid, 0)
+        for book_category in book_categories
+    }
+
+    etag = make_weak_etag(
+        (book_category.uid, book_category.updated_at, book_counts[book_category.uid])
+        for book_category in book_categories
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "List of book categories",
-            "book_categories": [
-                BookCategoryResponseSchema(
-                    **json.loads(book_category.model_dump_json())
-                ).model_dump()
-                for book_category in book_categories
-            ],
+            "book_categories": book_category_list_adapter.validate_python(
+                book_categories
+            ),
+            "book_counts": book_counts,
         },
+        headers={"ETag": etag},
     )
 
 
 @book_category_router.get("/get/name/{category}", status_code=status.HTTP_200_OK)
 async def get_book_category_by_id(
-    category: str, session: AsyncSession = Depends(get_session)
+    request: Request, category: str, session: AsyncSession = Depends(get_session)
 ):
     book_category = await book_category_service.get_book_category_by_category(
         category, session
@@ -133,20 +200,23 @@ async def get_book_category_by_id(
             content={"message": "Book category not found"},
         )
 
+    etag = make_etag(book_category.uid, book_category.updated_at)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Book category found",
-            "book_category": BookCategoryResponseSchema(
-                **json.loads(book_category.model_dump_json())
-            ).model_dump(),
+            "book_category": BookCategoryResponseSchema.model_validate(book_category),
         },
+        headers={"ETag": etag},
     )
 
 
 @book_category_router.get("/get/uid/{category_uid}", status_code=status.HTTP_200_OK)
 async def get_book_category_by_uid(
-    category_uid: str, session: AsyncSession = Depends(get_session)
+    request: Request, category_uid: str, session: AsyncSession = Depends(get_session)
 ):
     book_category = await book_category_service.get_book_category_by_uid(
         category_uid, session
@@ -158,14 +228,17 @@ async def get_book_category_by_uid(
             content={"message": "Book category not found"},
         )
 
+    etag = make_etag(book_category.uid, book_category.updated_at)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Book category found",
-            "book_category": BookCategoryResponseSchema(
-                **json.loads(book_category.model_dump_json())
-            ).model_dump(),
+            "book_category": BookCategoryResponseSchema.model_validate(book_category),
         },
+        headers={"ETag": etag},
     )
 
 
@@ -192,9 +265,7 @@ async def create_book_genre(
         status_code=status.HTTP_201_CREATED,
         content={
             "message": "Book genre created successfully",
-            "book_genre": BookGenreResponseSchema(
-                **json.loads(book_genre.model_dump_json())
-            ).model_dump(),
+            "book_genre": BookGenreResponseSchema.model_validate(book_genre),
         },
     )
 
@@ -228,9 +299,7 @@ async def update_book_genre(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Book genre updated successfully",
-            "book_genre": BookGenreResponseSchema(
-                **json.loads(book_genre.model_dump_json())
-            ).model_dump(),
+            "book_genre": BookGenreResponseSchema.model_validate(book_genre),
         },
     )
 
@@ -240,26 +309,37 @@ async def list_book_genres(
     request: Request, session: AsyncSession = Depends(get_session)
 ):
     page = int(request.query_params.get("page", 1))
+    limit = parse_page_size(request.query_params.get("limit"))
+
+    book_genres = await book_genre_service.list_book_genres(page, session, limit)
+    book_counts = await book_genre_service.get_book_counts(
+        [book_genre.uid for book_genre in book_genres], session
+    )
+    book_counts = {
+        book_genre.uid: book_counts.get(book_genre.uid, 0) for book_genre in book_genres
+    }
 
-    book_genres = await book_genre_service.list_book_genres(page, session)
+    etag = make_weak_etag(
+        (book_genre.uid, book_genre.updated_at, book_counts[book_genre.uid])
+        for book_genre in book_genres
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "List of book genres",
-            "book_genres": [
-                BookGenreResponseSchema(
-                    **json.loads(book_genre.model_dump_json())
-                ).model_dump()
-                for book_genre in book_genres
-            ],
+            "book_genres": book_genre_list_adapter.validate_python(book_genres),
+            "book_counts": book_counts,
         },
+        headers={"ETag": etag},
     )
 
 
 @book_genre_router.get("/get/name/{genre}", status_code=status.HTTP_200_OK)
 async def get_book_genre_by_id(
-    genre: str, session: AsyncSession = Depends(get_session)
+    request: Request, genre: str, session: AsyncSession = Depends(get_session)
 ):
     book_genre = await book_genre_service.get_book_genre_by_genre(genre, session)
 
@@ -269,20 +349,23 @@ async def get_book_genre_by_id(
             content={"message": "Book genre not found"},
         )
 
+    etag = make_etag(book_genre.uid, book_genre.updated_at)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Book genre found",
-            "book_genre": BookGenreResponseSchema(
-                **json.loads(book_genre.model_dump_json())
-            ).model_dump(),
+            "book_genre": BookGenreResponseSchema.model_validate(book_genre),
         },
+        headers={"ETag": etag},
     )
 
 
 @book_genre_router.get("/get/uid/{genre_uid}", status_code=status.HTTP_200_OK)
 async def get_book_genre_by_uid(
-    genre_uid: str, session: AsyncSession = Depends(get_session)
+    request: Request, genre_uid: str, session: AsyncSession = Depends(get_session)
 ):
     book_genre = await book_genre_service.get_book_genre_by_uid(genre_uid, session)
 
@@ -292,14 +375,17 @@ async def get_book_genre_by_uid(
             content={"message": "Book genre not found"},
         )
 
+    etag = make_etag(book_genre.uid, book_genre.updated_at)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Book genre found",
-            "book_genre": BookGenreResponseSchema(
-                **json.loads(book_genre.model_dump_json())
-            ).model_dump(),
+            "book_genre": BookGenreResponseSchema.model_validate(book_genre),
         },
+        headers={"ETag": etag},
     )
 
 
@@ -329,9 +415,75 @@ async def create_book(
         status_code=status.HTTP_201_CREATED,
         content={
             "message": "Book created successfully",
-            "book": BookResponseSchema(
-                **json.loads(book.model_dump_json())
-            ).model_dump(),
+            "book": BookResponseSchema.model_validate(book),
+        },
+    )
+
+
+@book_router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+async def import_books(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    user_uid: str = Depends(get_current_user_uid),
+):
+    form = await request.form()
+    book_import_file = form.get("book_import")
+
+    if not book_import_file:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Book import file not found"},
+        )
+
+    format = request.query_params.get("format") or BOOK_IMPORT_FORMATS.get(
+        os.path.splitext(book_import_file.filename or "")[1].lower()
+    )
+    if format not in BOOK_IMPORT_CONTENT_TYPES:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Book import must be NDJSON or CSV"},
+        )
+
+    object_name = f"imports/{uuid.uuid4().hex}.{format}"
+    await upload_fileobj(
+        object_name, book_import_file.file, BOOK_IMPORT_CONTENT_TYPES[format]
+    )
+
+    book_import = await book_import_service.create_book_import(
+        user_uid, object_name, format, session
+    )
+    import_books_task.delay(str(book_import.uid))
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "message": "Book import queued",
+            "book_import": BookImportResponseSchema.model_validate(book_import),
+        },
+    )
+
+
+@book_router.get("/import/{book_import_uid}", status_code=status.HTTP_200_OK)
+async def get_book_import(
+    book_import_uid: str,
+    session: AsyncSession = Depends(get_session),
+    user_uid: str = Depends(get_current_user_uid),
+):
+    book_import = await book_import_service.get_book_import(
+        book_import_uid, user_uid, session
+    )
+
+    if not book_import:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Book import not found"},
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Book import found",
+            "book_import": BookImportResponseSchema.model_validate(book_import),
         },
     )
 
@@ -363,33 +515,281 @@ async def update_book(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Book updated successfully",
-            "book": BookResponseSchema(
-                **json.loads(book.model_dump_json())
-            ).model_dump(),
+            "book": BookResponseSchema.model_validate(book),
         },
     )
 
 
 @book_router.get("/list", status_code=status.HTTP_200_OK)
 async def list_books(request: Request, session: AsyncSession = Depends(get_session)):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
     page = int(request.query_params.get("page", 1))
+    cursor = request.query_params.get("cursor")
+
+    try:
+        expand = parse_book_expand(request.query_params.get("expand"))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid expand"},
+        )
+
+    limit = parse_page_size(request.query_params.get("limit"))
+    try:
+        fields = parse_fields(request.query_params.get("fields"), BOOK_FIELDS)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid fields"},
+        )
+
+    try:
+        books = await book_service.list_books(
+            page, session, cursor, limit, load_book_fields(fields, expand)
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
+
+    expansion = await book_expander.expand_books(books, expand, session)
+
+    etag = make_weak_etag(
+        chain(((book.uid, book.updated_at) for book in books), expansion.versions())
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    content = {
+        "message": "List of books",
+        "books": serialize_books(books, fields),
+    }
+    if cursor is not None:
+        content["next_cursor"] = book_service.get_next_cursor(books, limit)
+    if expand:
+        content["included"] = expansion.content()
+
+    response = JSONResponse(
+        status_code=status.HTTP_200_OK, content=content, headers={"ETag": etag}
+    )
+
+    return await response_cache.set_response(
+        request,
+        response,
+        [
+            "books",
+            *(f"book:{book.uid}" for book in books),
+            *expansion.cache_tags(),
+        ],
+    )
+
+
+@book_router.get("/search", status_code=status.HTTP_200_OK)
+async def search_books(request: Request, session: AsyncSession = Depends(get_session)):
+    query = request.query_params.get("q", "").strip()
+    cursor = request.query_params.get("cursor")
+
+    if not query:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Search query is required"},
+        )
+
+    try:
+        expand = parse_book_expand(request.query_params.get("expand"))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid expand"},
+        )
+
+    limit = parse_page_size(request.query_params.get("limit"))
+    try:
+        fields = parse_fields(request.query_params.get("fields"), BOOK_FIELDS)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid fields"},
+        )
+
+    try:
+        books, next_cursor = await book_service.search_books(
+            query, session, cursor, limit, load_book_fields(fields, expand)
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
+
+    content = {
+        "message": "Search results",
+        "books": serialize_books(books, fields),
+        "next_cursor": next_cursor,
+    }
+    if expand:
+        expansion = await book_expander.expand_books(books, expand, session)
+        content["included"] = expansion.content()
+
+    return JSONResponse(status_code=status.HTTP_200_OK, content=content)
+
+
+@book_router.get("/query", status_code=status.HTTP_200_OK)
+async def query_books(request: Request, session: AsyncSession = Depends(get_session)):
+    query_params = request.query_params
+    cursor = query_params.get("cursor")
+    facets = query_params.get("facets", "").lower() in ("1", "true")
+
+    limit = parse_page_size(query_params.get("limit"))
+    try:
+        fields = parse_fields(query_params.get("fields"), BOOK_FIELDS)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid fields"},
+        )
+
+    try:
+        filters = book_service.get_query_filters(
+            authors=parse_uid_list(query_params.get("authors")),
+            categories=parse_uid_list(query_params.get("categories")),
+            genres=parse_uid_list(query_params.get("genres")),
+            published_from=parse_optional(
+                query_params.get("published_from"), date.fromisoformat
+            ),
+            published_to=parse_optional(
+                query_params.get("published_to"), date.fromisoformat
+            ),
+            min_pages=parse_optional(query_params.get("min_pages"), int),
+            max_pages=parse_optional(query_params.get("max_pages"), int),
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid query filter"},
+        )
+
+    try:
+        books, facet_counts = await book_service.query_books(
+            filters, session, cursor, limit, fields, facets
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
+
+    content = {
+        "message": "Query results",
+        "books": serialize_books(books, fields),
+        "next_cursor": book_service.get_next_cursor(books, limit),
+    }
+    if facets:
+        content["facets"] = facet_counts
+
+    return JSONResponse(status_code=status.HTTP_200_OK, content=content)
+
+
+@book_router.get("/export", status_code=status.HTTP_200_OK)
+async def export_book_catalog(request: Request):
+    format = request.query_params.get("format", "ndjson")
+    if format not in BOOK_EXPORT_CONTENT_TYPES:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Export format must be ndjson or csv"},
+        )
+
+    filters = {
+        field: request.query_params.get(field)
+        for field in ("author", "category", "genre")
+    }
+    updated_since = request.query_params.get("updated_since")
+
+    try:
+        for value in filters.values():
+            if value:
+                uuid.UUID(value)
+        if updated_since:
+            updated_since = datetime.fromisoformat(updated_since)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid export filter"},
+        )
 
-    books = await book_service.list_books(page, session)
+    statement = book_service.get_export_statement(
+        **filters, updated_since=updated_since
+    )
+
+    # The request-scoped session is closed before the body is sent, so the
+    # stream checks out its own connection for the server-side cursor.
+    async def stream_export():
+        async for session in get_session():
+            books = book_service.stream_books(statement, session)
+            async for chunk in export_books(books, format, session):
+                yield chunk
+
+    return StreamingResponse(
+        stream_export(),
+        media_type=BOOK_EXPORT_CONTENT_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="books.{format}"',
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@book_router.get("/autocomplete", status_code=status.HTTP_200_OK)
+async def autocomplete(request: Request, session: AsyncSession = Depends(get_session)):
+    query = request.query_params.get("q", "").strip()
+    limit = parse_page_size(request.query_params.get("limit"), 10, 20)
+
+    if not query:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Search query is required"},
+        )
+
+    suggestions = await book_service.autocomplete(query, limit, session)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "message": "List of books",
-            "books": [
-                BookResponseSchema(**json.loads(book.model_dump_json())).model_dump()
-                for book in books
-            ],
+            "message": "Autocomplete suggestions",
+            "suggestions": autocomplete_suggestion_list_adapter.validate_python(
+                suggestions
+            ),
         },
     )
 
 
 @book_router.get("/get/isbn/{isbn}", status_code=status.HTTP_200_OK)
-async def get_book_by_isbn(isbn: str, session: AsyncSession = Depends(get_session)):
+async def get_book_by_isbn(
+    request: Request, isbn: str, session: AsyncSession = Depends(get_session)
+):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
+    try:
+        expand = parse_book_expand(request.query_params.get("expand"))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid expand"},
+        )
+
+    if request.headers.get("if-none-match") and not expand:
+        book_version = await book_service.get_book_version_by_isbn(isbn, session)
+        if book_version:
+            etag = make_etag(*book_version)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
     book = await book_service.get_book_by_isbn(isbn, session)
 
     if not book:
@@ -398,19 +798,84 @@ async def get_book_by_isbn(isbn: str, session: AsyncSession = Depends(get_sessio
             content={"message": "Book not found"},
         )
 
+    if expand:
+        expansion = await book_expander.expand_books([book], expand, session)
+        etag = make_weak_etag(
+            chain([(book.uid, book.updated_at)], expansion.versions())
+        )
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+    else:
+        expansion = None
+        etag = make_etag(book.uid, book.updated_at)
+
+    content = {
+        "message": "Book found",
+        "book": BookResponseSchema.model_validate(book),
+    }
+    if expansion is not None:
+        content["included"] = expansion.content()
+
+    response = JSONResponse(
+        status_code=status.HTTP_200_OK, content=content, headers={"ETag": etag}
+    )
+
+    return await response_cache.set_response(
+        request,
+        response,
+        [f"book:{book.uid}", *(expansion.cache_tags() if expansion else ())],
+    )
+
+
+@book_router.post("/get/batch", status_code=status.HTTP_200_OK)
+async def get_books_by_uids(
+    batch_data: BookBatchGetSchema, session: AsyncSession = Depends(get_session)
+):
+    uids = list(dict.fromkeys(batch_data.uids))
+    if len(uids) > Config.BATCH_GET_MAX_SIZE:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "message": f"At most {Config.BATCH_GET_MAX_SIZE} uids are allowed"
+            },
+        )
+
+    books = await book_service.get_books_by_uids(uids, session)
+    found_uids = {book.uid for book in books}
+
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "message": "Book found",
-            "book": BookResponseSchema(
-                **json.loads(book.model_dump_json())
-            ).model_dump(),
+            "message": "Books found",
+            "books": book_list_adapter.validate_python(books),
+            "missing": [uid for uid in uids if uid not in found_uids],
         },
     )
 
 
 @book_router.get("/get/uid/{book_uid}", status_code=status.HTTP_200_OK)
-async def get_book_by_uid(book_uid: str, session: AsyncSession = Depends(get_session)):
+async def get_book_by_uid(
+    request: Request, book_uid: str, session: AsyncSession = Depends(get_session)
+):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
+    try:
+        expand = parse_book_expand(request.query_params.get("expand"))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid expand"},
+        )
+
+    if request.headers.get("if-none-match") and not expand:
+        book_version = await book_service.get_book_version_by_uid(book_uid, session)
+        if book_version:
+            etag = make_etag(*book_version)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
     book = await book_service.get_book_by_uid(book_uid, session)
 
     if not book:
@@ -419,19 +884,54 @@ async def get_book_by_uid(book_uid: str, session: AsyncSession = Depends(get_ses
             content={"message": "Book not found"},
         )
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={
-            "message": "Book found",
-            "book": BookResponseSchema(
-                **json.loads(book.model_dump_json())
-            ).model_dump(),
-        },
+    if expand:
+        expansion = await book_expander.expand_books([book], expand, session)
+        etag = make_weak_etag(
+            chain([(book.uid, book.updated_at)], expansion.versions())
+        )
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+    else:
+        expansion = None
+        etag = make_etag(book.uid, book.updated_at)
+
+    content = {
+        "message": "Book found",
+        "book": BookResponseSchema.model_validate(book),
+    }
+    if expansion is not None:
+        content["included"] = expansion.content()
+
+    response = JSONResponse(
+        status_code=status.HTTP_200_OK, content=content, headers={"ETag": etag}
+    )
+
+    return await response_cache.set_response(
+        request,
+        response,
+        [f"book:{book.uid}", *(expansion.cache_tags() if expansion else ())],
     )
 
 
 @book_router.get("/get/title/{title}", status_code=status.HTTP_200_OK)
-async def get_book_by_title(title: str, session: AsyncSession = Depends(get_session)):
+async def get_book_by_title(
+    request: Request, title: str, session: AsyncSession = Depends(get_session)
+):
+    try:
+        expand = parse_book_expand(request.query_params.get("expand"))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid expand"},
+        )
+
+    if request.headers.get("if-none-match") and not expand:
+        book_version = await book_service.get_book_version_by_title(title, session)
+        if book_version:
+            etag = make_etag(*book_version)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
     book = await book_service.get_book_by_title(title, session)
 
     if not book:
@@ -440,14 +940,26 @@ async def get_book_by_title(title: str, session: AsyncSession = Depends(get_sess
             content={"message": "Book not found"},
         )
 
+    if expand:
+        expansion = await book_expander.expand_books([book], expand, session)
+        etag = make_weak_etag(
+            chain([(book.uid, book.updated_at)], expansion.versions())
+        )
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+    else:
+        expansion = None
+        etag = make_etag(book.uid, book.updated_at)
+
+    content = {
+        "message": "Book found",
+        "book": BookResponseSchema.model_validate(book),
+    }
+    if expansion is not None:
+        content["included"] = expansion.content()
+
     return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={
-            "message": "Book found",
-            "book": BookResponseSchema(
-                **json.loads(book.model_dump_json())
-            ).model_dump(),
-        },
+        status_code=status.HTTP_200_OK, content=content, headers={"ETag": etag}
     )
 
 
@@ -455,19 +967,69 @@ async def get_book_by_title(title: str, session: AsyncSession = Depends(get_sess
 async def list_books_by_category(
     request: Request, category: str, session: AsyncSession = Depends(get_session)
 ):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
     page = int(request.query_params.get("page", 1))
+    cursor = request.query_params.get("cursor")
 
-    books = await book_service.list_books_by_category(category, page, session)
+    try:
+        expand = parse_book_expand(request.query_params.get("expand"))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid expand"},
+        )
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={
-            "message": "List of books by category",
-            "books": [
-                BookResponseSchema(**json.loads(book.model_dump_json())).model_dump()
-                for book in books
-            ],
-        },
+    limit = parse_page_size(request.query_params.get("limit"))
+    try:
+        fields = parse_fields(request.query_params.get("fields"), BOOK_FIELDS)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid fields"},
+        )
+
+    try:
+        books = await book_service.list_books_by_category(
+            category, page, session, cursor, limit, load_book_fields(fields, expand)
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
+
+    expansion = await book_expander.expand_books(books, expand, session)
+
+    etag = make_weak_etag(
+        chain(((book.uid, book.updated_at) for book in books), expansion.versions())
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    content = {
+        "message": "List of books by category",
+        "books": serialize_books(books, fields),
+    }
+    if cursor is not None:
+        content["next_cursor"] = book_service.get_next_cursor(books, limit)
+    if expand:
+        content["included"] = expansion.content()
+
+    response = JSONResponse(
+        status_code=status.HTTP_200_OK, content=content, headers={"ETag": etag}
+    )
+
+    return await response_cache.set_response(
+        request,
+        response,
+        [
+            "books",
+            *(f"book:{book.uid}" for book in books),
+            *expansion.cache_tags(),
+        ],
     )
 
 
@@ -475,19 +1037,69 @@ async def list_books_by_category(
 async def list_books_by_genre(
     request: Request, genre: str, session: AsyncSession = Depends(get_session)
 ):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
     page = int(request.query_params.get("page", 1))
+    cursor = request.query_params.get("cursor")
 
-    books = await book_service.list_books_by_genre(genre, page, session)
+    try:
+        expand = parse_book_expand(request.query_params.get("expand"))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid expand"},
+        )
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={
-            "message": "List of books by genre",
-            "books": [
-                BookResponseSchema(**json.loads(book.model_dump_json())).model_dump()
-                for book in books
-            ],
-        },
+    limit = parse_page_size(request.query_params.get("limit"))
+    try:
+        fields = parse_fields(request.query_params.get("fields"), BOOK_FIELDS)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid fields"},
+        )
+
+    try:
+        books = await book_service.list_books_by_genre(
+            genre, page, session, cursor, limit, load_book_fields(fields, expand)
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
+
+    expansion = await book_expander.expand_books(books, expand, session)
+
+    etag = make_weak_etag(
+        chain(((book.uid, book.updated_at) for book in books), expansion.versions())
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    content = {
+        "message": "List of books by genre",
+        "books": serialize_books(books, fields),
+    }
+    if cursor is not None:
+        content["next_cursor"] = book_service.get_next_cursor(books, limit)
+    if expand:
+        content["included"] = expansion.content()
+
+    response = JSONResponse(
+        status_code=status.HTTP_200_OK, content=content, headers={"ETag": etag}
+    )
+
+    return await response_cache.set_response(
+        request,
+        response,
+        [
+            "books",
+            *(f"book:{book.uid}" for book in books),
+            *expansion.cache_tags(),
+        ],
     )
 
 
@@ -495,19 +1107,69 @@ async def list_books_by_genre(
 async def list_books_by_author(
     request: Request, author: str, session: AsyncSession = Depends(get_session)
 ):
+    cached_response = await response_cache.get_response(request)
+    if cached_response is not None:
+        return cached_response
+
     page = int(request.query_params.get("page", 1))
+    cursor = request.query_params.get("cursor")
 
-    books = await book_service.list_books_by_author(author, page, session)
+    try:
+        expand = parse_book_expand(request.query_params.get("expand"))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid expand"},
+        )
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content={
-            "message": "List of books by author",
-            "books": [
-                BookResponseSchema(**json.loads(book.model_dump_json())).model_dump()
-                for book in books
-            ],
-        },
+    limit = parse_page_size(request.query_params.get("limit"))
+    try:
+        fields = parse_fields(request.query_params.get("fields"), BOOK_FIELDS)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid fields"},
+        )
+
+    try:
+        books = await book_service.list_books_by_author(
+            author, page, session, cursor, limit, load_book_fields(fields, expand)
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
+
+    expansion = await book_expander.expand_books(books, expand, session)
+
+    etag = make_weak_etag(
+        chain(((book.uid, book.updated_at) for book in books), expansion.versions())
+    )
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+
+    content = {
+        "message": "List of books by author",
+        "books": serialize_books(books, fields),
+    }
+    if cursor is not None:
+        content["next_cursor"] = book_service.get_next_cursor(books, limit)
+    if expand:
+        content["included"] = expansion.content()
+
+    response = JSONResponse(
+        status_code=status.HTTP_200_OK, content=content, headers={"ETag": etag}
+    )
+
+    return await response_cache.set_response(
+        request,
+        response,
+        [
+            "books",
+            *(f"book:{book.uid}" for book in books),
+            *expansion.cache_tags(),
+        ],
     )
 
 
@@ -541,27 +1203,36 @@ async def update_book_image(
             content={"message": "Book image limit reached"},
         )
 
-    book_image_content = await book_image.read()
-    book_image_extension = os.path.splitext(book_image.filename)[1]
-    book_image_file_name = (
-        f"book_images/{book_uid}-{len(book.images) + 1}{book_image_extension}"
+    book_image_file_name = await stored_image_service.store_image(
+        book_image.file, book_image.filename, book_image.content_type, session
     )
 
-    upload_image_task.delay(
-        book_image_content,
-        book_image_file_name,
-        book_image.content_type,
-    )
+    file_url = get_object_url(book_image_file_name)
+    if file_url in book.images:
+        await session.rollback()
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Book image already added"},
+        )
 
-    file_url = f"http://{Config.DOMAIN}/minio/storage/{Config.MINIO_STORAGE_BUCKET}/{book_image_file_name}"
     book = await book_service.update_book_image(book, file_url, session)
+    upload_job = await upload_job_service.create_upload_job(
+        user_uid,
+        "book_image",
+        book_uid,
+        session,
+        status="stored",
+        object_name=book_image_file_name,
+    )
+    generate_book_image_variants_task.delay(
+        book_uid, book_image_file_name, str(upload_job.uid)
+    )
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
             "message": "Book image updated successfully",
-            "book": BookResponseSchema(
-                **json.loads(book.model_dump_json())
-            ).model_dump(),
+            "book": BookResponseSchema.model_validate(book),
+            "upload_job": UploadJobResponseSchema.model_validate(upload_job),
         },
     )
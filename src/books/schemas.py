@@ -1,3 +1,7 @@
+import uuid
+from datetime import date, datetime
+from typing import Literal, Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -21,18 +25,19 @@ class BookCategoryCreateSchema(BaseModel):
 
 
 class BookCategoryResponseSchema(BaseModel):
-    uid: str
+    uid: uuid.UUID
     category: str
     description: str
 
     model_config = {
+        "from_attributes": True,
         "json_schema_extra": {
             "example": {
                 "uid": "123e4567-e89b-12d3-a456-426614174000",
                 "category": "Science Fiction",
                 "description": "Books that explore the future of humanity, technology, and the universe.",
             }
-        }
+        },
     }
 
 
@@ -56,18 +61,19 @@ class BookGenreCreateSchema(BaseModel):
 
 
 class BookGenreResponseSchema(BaseModel):
-    uid: str
+    uid: uuid.UUID
     genre: str
     description: str
 
     model_config = {
+        "from_attributes": True,
         "json_schema_extra": {
             "example": {
                 "uid": "123e4567-e89b-12d3-a456-426614174000",
                 "genre": "Fantasy",
                 "description": "Books that feature magic, mythical creatures, and epic adventures.",
             }
-        }
+        },
     }
 
 
@@ -106,19 +112,48 @@ class BookCreateSchema(BaseModel):
     }
 
 
+class BookBatchGetSchema(BaseModel):
+    uids: list[uuid.UUID] = Field(
+        min_length=1, description="The uids of the books to fetch, in order."
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "uids": [
+                    "123e4567-e89b-12d3-a456-426614174000",
+                    "123e4567-e89b-12d3-a456-426614174001",
+                ]
+            }
+        }
+    }
+
+
+class BookImageSourceSchema(BaseModel):
+    type: str
+    srcset: str
+
+
+class BookImageVariantsSchema(BaseModel):
+    thumbnail: Optional[str] = None
+    sources: list[BookImageSourceSchema] = []
+
+
 class BookResponseSchema(BaseModel):
-    uid: str
+    uid: uuid.UUID
     title: str
     description: str
     isbn: str
-    published_date: str
+    published_date: date
     page_count: int
-    authors: list[str]
-    categories: list[str]
-    genres: list[str]
+    authors: list[uuid.UUID]
+    categories: list[uuid.UUID]
+    genres: list[uuid.UUID]
     images: list[str]
+    image_variants: dict[str, BookImageVariantsSchema] = {}
 
     model_config = {
+        "from_attributes": True,
         "json_schema_extra": {
             "example": {
                 "uid": "123e4567-e89b-12d3-a456-426614174000",
@@ -127,14 +162,98 @@ class BookResponseSchema(BaseModel):
                 "isbn": "9780441172719",
                 "published_date": "1965-06-01",
                 "page_count": 604,
-                "authors": ["Frank Herbert"],
-                "categories": ["Fiction"],
-                "genres": ["Science Fiction"],
+                "authors": ["123e4567-e89b-12d3-a456-426614174001"],
+                "categories": ["123e4567-e89b-12d3-a456-426614174002"],
+                "genres": ["123e4567-e89b-12d3-a456-426614174003"],
                 "images": [
                     "https://example.com/book-image-1.jpg",
                     "https://example.com/book-image-2.jpg",
                     "https://example.com/book-image-3.jpg",
                 ],
+                "image_variants": {
+                    "https://example.com/book-image-1.jpg": {
+                        "thumbnail": "https://example.com/book-image-1/thumbnail.webp",
+                        "sources": [
+                            {
+                                "type": "image/avif",
+                                "srcset": "https://example.com/book-image-1/w320.avif 320w, https://example.com/book-image-1/w640.avif 640w",
+                            },
+                            {
+                                "type": "image/webp",
+                                "srcset": "https://example.com/book-image-1/w320.webp 320w, https://example.com/book-image-1/w640.webp 640w",
+                            },
+                        ],
+                    }
+                },
             }
-        }
+        },
+    }
+
+
+class BookExportSchema(BookResponseSchema):
+    created_at: datetime
+    updated_at: datetime
+
+
+class AutocompleteSuggestionSchema(BaseModel):
+    type: str
+    uid: uuid.UUID
+    label: str
+    score: float
+
+    model_config = {
+        "from_attributes": True,
+        "json_schema_extra": {
+            "example": {
+                "type": "book",
+                "uid": "123e4567-e89b-12d3-a456-426614174000",
+                "label": "Dune",
+                "score": 0.8,
+            }
+        },
+    }
+
+
+class BookImportErrorSchema(BaseModel):
+    row: int
+    isbn: Optional[str] = None
+    errors: list[str]
+
+
+class BookImportResponseSchema(BaseModel):
+    uid: uuid.UUID
+    format: Literal["ndjson", "csv"]
+    status: Literal["queued", "processing", "completed", "failed"]
+    total_rows: int
+    imported_rows: int
+    skipped_rows: int
+    failed_rows: int
+    errors: list[BookImportErrorSchema]
+    error: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {
+        "from_attributes": True,
+        "json_schema_extra": {
+            "example": {
+                "uid": "5f0c3a2e-8d4b-4c7e-9a61-2b7d0e9f1c34",
+                "format": "ndjson",
+                "status": "processing",
+                "total_rows": 12000,
+                "imported_rows": 11890,
+                "skipped_rows": 105,
+                "failed_rows": 5,
+                "errors": [
+                    {
+                        "row": 418,
+                        "isbn": "9780441172719",
+                        "errors": ["Unknown author: Frank Herbertt"],
+                    }
+                ],
+                "error": None,
+                "created_at": "2024-10-17T09:00:00",
+                "updated_at": "2024-10-17T09:00:42",
+            }
+        },
     }
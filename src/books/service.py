@@ -1,7 +1,45 @@
-from sqlalchemy import select
+import uuid
+from datetime import date, datetime
+from typing import Optional
+
+import sqlalchemy.dialects.postgresql as pg
+from sqlalchemy import (
+    and_,
+    any_,
+    cast,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .models import Book, BookCategory, BookGenre
+from pkg.pagination import decode_cursor, encode_cursor
+from pkg.projection import DEFAULT_PAGE_SIZE, load_fields
+from pkg.response_cache import response_cache
+from src.authors.models import Author
+
+from .cache import book_category_cache, book_genre_cache
+from .models import Book, BookCategory, BookFacetCount, BookGenre, BookImport
+
+BOOK_EXPORT_BATCH_SIZE = 1000
+
+
+async def get_book_facet_counts(facet: str, uids: list, session: AsyncSession):
+    if not uids:
+        return {}
+
+    result = await session.execute(
+        select(BookFacetCount.uid, BookFacetCount.count).where(
+            BookFacetCount.facet == facet,
+            BookFacetCount.uid == any_(cast(uids, pg.ARRAY(pg.UUID))),
+        )
+    )
+    return {row.uid: row.count for row in result.all()}
 
 
 class BookCategoryService:
@@ -16,40 +54,49 @@ class BookCategoryService:
         session.add(book_category)
         await session.commit()
         await session.refresh(book_category)
+        await book_category_cache.publish_invalidation()
 
         return book_category
 
     async def update_book_category(
         self, book_category: BookCategory, category_data: dict, session: AsyncSession
     ):
+        book_category = await session.get(BookCategory, book_category.uid)
         for field, value in category_data.items():
             setattr(book_category, field, value)
 
         await session.commit()
         await session.refresh(book_category)
+        await book_category_cache.publish_invalidation()
+        await response_cache.invalidate(f"book_category:{book_category.uid}")
 
         return book_category
 
     async def get_book_category_by_uid(self, uid: str, session: AsyncSession):
-        result = await session.execute(
-            select(BookCategory).where(BookCategory.uid == uid)
-        )
-        book_category = result.scalars().first()
-        return book_category
+        return await book_category_cache.get_by_uid(uid)
 
     async def get_book_category_by_category(self, category: str, session: AsyncSession):
-        result = await session.execute(
-            select(BookCategory).where(BookCategory.category == category)
-        )
-        book_category = result.scalars().first()
-        return book_category
+        return await book_category_cache.get_by_name(category)
+
+    async def list_book_categories(
+        self, page: int, session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE
+    ):
+        book_categories = await book_category_cache.get_items()
+        return book_categories[(page - 1) * limit : page * limit]
+
+    async def get_book_category_uids_by_names(self, names: list, session: AsyncSession):
+        if not names:
+            return {}
 
-    async def list_book_categories(self, page: int, session: AsyncSession):
         result = await session.execute(
-            select(BookCategory).offset((page - 1) * 10).limit(10)
+            select(BookCategory.category, BookCategory.uid).where(
+                BookCategory.category == any_(cast(names, pg.ARRAY(pg.VARCHAR)))
+            )
         )
-        book_categories = result.scalars().all()
-        return book_categories
+        return {row.category: row.uid for row in result.all()}
+
+    async def get_book_counts(self, uids: list, session: AsyncSession):
+        return await get_book_facet_counts("category", uids, session)
 
 
 class BookGenreService:
@@ -64,38 +111,49 @@ class BookGenreService:
         session.add(book_genre)
         await session.commit()
         await session.refresh(book_genre)
+        await book_genre_cache.publish_invalidation()
 
         return book_genre
 
     async def update_book_genre(
         self, book_genre: BookGenre, genre_data: dict, session: AsyncSession
     ):
+        book_genre = await session.get(BookGenre, book_genre.uid)
         for field, value in genre_data.items():
             setattr(book_genre, field, value)
 
         await session.commit()
         await session.refresh(book_genre)
+        await book_genre_cache.publish_invalidation()
+        await response_cache.invalidate(f"book_genre:{book_genre.uid}")
 
         return book_genre
 
     async def get_book_genre_by_uid(self, uid: str, session: AsyncSession):
-        result = await session.execute(select(BookGenre).where(BookGenre.uid == uid))
-        book_genre = result.scalars().first()
-        return book_genre
+        return await book_genre_cache.get_by_uid(uid)
 
     async def get_book_genre_by_genre(self, genre: str, session: AsyncSession):
-        result = await session.execute(
-            select(BookGenre).where(BookGenre.genre == genre)
-        )
-        book_genre = result.scalars().first()
-        return book_genre
+        return await book_genre_cache.get_by_name(genre)
+
+    async def list_book_genres(
+        self, page: int, session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE
+    ):
+        book_genres = await book_genre_cache.get_items()
+        return book_genres[(page - 1) * limit : page * limit]
+
+    async def get_book_genre_uids_by_names(self, names: list, session: AsyncSession):
+        if not names:
+            return {}
 
-    async def list_book_genres(self, page: int, session: AsyncSession):
         result = await session.execute(
-            select(BookGenre).offset((page - 1) * 10).limit(10)
+            select(BookGenre.genre, BookGenre.uid).where(
+                BookGenre.genre == any_(cast(names, pg.ARRAY(pg.VARCHAR)))
+            )
         )
-        book_genres = result.scalars().all()
-        return book_genres
+        return {row.genre: row.uid for row in result.all()}
+
+    async def get_book_counts(self, uids: list, session: AsyncSession):
+        return await get_book_facet_counts("genre", uids, session)
 
 
 class BookService:
@@ -113,15 +171,27 @@ class BookService:
         session.add(book)
         await session.commit()
         await session.refresh(book)
+        await response_cache.invalidate("books")
 
         return book
 
     async def update_book(self, book: Book, book_data: dict, session: AsyncSession):
+        # Lists are tagged with the books they contain, so only a change that
+        # can move a book in or out of a filtered list needs them all dropped.
+        cache_tags = [f"book:{book.uid}"]
+        if any(
+            field in ("authors", "categories", "genres")
+            and list(map(str, getattr(book, field))) != list(map(str, value))
+            for field, value in book_data.items()
+        ):
+            cache_tags.append("books")
+
         for field, value in book_data.items():
             setattr(book, field, value)
 
         await session.commit()
         await session.refresh(book)
+        await response_cache.invalidate(*cache_tags)
 
         return book
 
@@ -130,6 +200,48 @@ class BookService:
         book = result.scalars().first()
         return book
 
+    async def get_books_by_uids(self, uids: list, session: AsyncSession):
+        if not uids:
+            return []
+
+        result = await session.execute(
+            select(Book).where(Book.uid == any_(cast(uids, pg.ARRAY(pg.UUID))))
+        )
+        books = {book.uid: book for book in result.scalars().all()}
+        return [books[uid] for uid in uids if uid in books]
+
+    async def get_existing_book_keys(
+        self, isbns: list, titles: list, session: AsyncSession
+    ):
+        result = await session.execute(
+            select(Book.isbn, Book.title).where(
+                or_(
+                    Book.isbn == any_(cast(isbns, pg.ARRAY(pg.VARCHAR))),
+                    Book.title == any_(cast(titles, pg.ARRAY(pg.VARCHAR))),
+                )
+            )
+        )
+        rows = result.all()
+        return {row.isbn for row in rows}, {row.title for row in rows}
+
+    async def get_book_version_by_uid(self, uid: str, session: AsyncSession):
+        result = await session.execute(
+            select(Book.uid, Book.updated_at).where(Book.uid == uid)
+        )
+        return result.first()
+
+    async def get_book_version_by_isbn(self, isbn: str, session: AsyncSession):
+        result = await session.execute(
+            select(Book.uid, Book.updated_at).where(Book.isbn == isbn)
+        )
+        return result.first()
+
+    async def get_book_version_by_title(self, title: str, session: AsyncSession):
+        result = await session.execute(
+            select(Book.uid, Book.updated_at).where(Book.title == title)
+        )
+        return result.first()
+
     async def get_book_by_isbn(self, isbn: str, session: AsyncSession):
         result = await session.execute(select(Book).where(Book.isbn == isbn))
         book = result.scalars().first()
@@ -140,46 +252,388 @@ class BookService:
         book = result.scalars().first()
         return book
 
-    async def list_books(self, page: int, session: AsyncSession):
-        result = await session.execute(select(Book).offset((page - 1) * 10).limit(10))
+    def contains_uid(self, column, uid: str):
+        return column.contains(cast([uid], pg.ARRAY(pg.UUID(as_uuid=False))))
+
+    def paginate(
+        self,
+        statement,
+        page: int,
+        cursor: Optional[str],
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
+    ):
+        statement = statement.options(
+            *load_fields(Book, fields, "uid", "created_at", "updated_at")
+        )
+        if cursor is None:
+            return statement.offset((page - 1) * limit).limit(limit)
+
+        statement = statement.order_by(Book.created_at, Book.uid).limit(limit)
+        if cursor:
+            created_at, uid = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+            statement = statement.where(
+                tuple_(Book.created_at, Book.uid) > tuple_(created_at, uid)
+            )
+
+        return statement
+
+    def get_next_cursor(
+        self, books: list[Book], limit: int = DEFAULT_PAGE_SIZE
+    ) -> Optional[str]:
+        if len(books) < limit:
+            return None
+
+        return encode_cursor(books[-1].created_at, books[-1].uid)
+
+    async def list_books(
+        self,
+        page: int,
+        session: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
+    ):
+        result = await session.execute(
+            self.paginate(select(Book), page, cursor, limit, fields)
+        )
         books = result.scalars().all()
         return books
 
     async def list_books_by_category(
-        self, category: str, page: int, session: AsyncSession
+        self,
+        category: str,
+        page: int,
+        session: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
     ):
         result = await session.execute(
-            select(Book).where(
-                Book.categories.contains(category).offset((page - 1) * 10).limit(10)
+            self.paginate(
+                select(Book).where(self.contains_uid(Book.categories, category)),
+                page,
+                cursor,
+                limit,
+                fields,
             )
         )
         books = result.scalars().all()
         return books
 
-    async def list_books_by_genre(self, genre: str, page: int, session: AsyncSession):
+    async def list_books_by_genre(
+        self,
+        genre: str,
+        page: int,
+        session: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
+    ):
         result = await session.execute(
-            select(Book)
-            .where(Book.genres.contains(genre))
-            .offset((page - 1) * 10)
-            .limit(10)
+            self.paginate(
+                select(Book).where(self.contains_uid(Book.genres, genre)),
+                page,
+                cursor,
+                limit,
+                fields,
+            )
         )
         books = result.scalars().all()
         return books
 
-    async def list_books_by_author(self, author: str, page: int, session: AsyncSession):
+    async def list_books_by_author(
+        self,
+        author: str,
+        page: int,
+        session: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
+    ):
         result = await session.execute(
-            select(Book)
-            .where(Book.authors.contains(author))
-            .offset((page - 1) * 10)
-            .limit(10)
+            self.paginate(
+                select(Book).where(self.contains_uid(Book.authors, author)),
+                page,
+                cursor,
+                limit,
+                fields,
+            )
         )
         books = result.scalars().all()
         return books
 
+    def overlaps_uids(self, column, uids: list):
+        return column.overlap(cast(uids, pg.ARRAY(pg.UUID(as_uuid=False))))
+
+    def get_query_filters(
+        self,
+        authors: list,
+        categories: list,
+        genres: list,
+        published_from: Optional[date] = None,
+        published_to: Optional[date] = None,
+        min_pages: Optional[int] = None,
+        max_pages: Optional[int] = None,
+    ) -> list:
+        filters = [
+            self.overlaps_uids(column, uids)
+            for column, uids in (
+                (Book.authors, authors),
+                (Book.categories, categories),
+                (Book.genres, genres),
+            )
+            if uids
+        ]
+        if published_from is not None:
+            filters.append(Book.published_date >= published_from)
+        if published_to is not None:
+            filters.append(Book.published_date <= published_to)
+        if min_pages is not None:
+            filters.append(Book.page_count >= min_pages)
+        if max_pages is not None:
+            filters.append(Book.page_count <= max_pages)
+
+        return filters
+
+    def get_facet_counts(self, facet: str, column, filters: list):
+        # Unfiltered counts cover the whole catalog, so they are read from the
+        # trigger-maintained count table instead of unnesting every book.
+        if not filters:
+            counts = (
+                select(BookFacetCount.uid, BookFacetCount.count)
+                .where(BookFacetCount.facet == facet, BookFacetCount.count > 0)
+                .subquery()
+            )
+        else:
+            values = select(func.unnest(column).label("uid")).where(*filters).subquery()
+            counts = (
+                select(values.c.uid, func.count().label("count"))
+                .group_by(values.c.uid)
+                .subquery()
+            )
+        return (
+            select(
+                func.coalesce(
+                    func.jsonb_object_agg(counts.c.uid, counts.c.count),
+                    cast({}, pg.JSONB),
+                )
+            )
+            .select_from(counts)
+            .scalar_subquery()
+        )
+
+    async def query_books(
+        self,
+        filters: list,
+        session: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
+        facets: bool = False,
+    ):
+        statement = self.paginate(
+            select(Book).where(*filters), 1, cursor or "", limit, fields
+        )
+        if not facets:
+            result = await session.execute(statement)
+            return result.scalars().all(), None
+
+        facet_counts = func.jsonb_build_object(
+            "authors",
+            self.get_facet_counts("author", Book.authors, filters),
+            "categories",
+            self.get_facet_counts("category", Book.categories, filters),
+            "genres",
+            self.get_facet_counts("genre", Book.genres, filters),
+        ).label("facets")
+
+        # The facet subqueries are uncorrelated, so Postgres runs each of them
+        # once per statement and the counts come back with the page.
+        result = await session.execute(statement.add_columns(facet_counts))
+        rows = result.all()
+        if rows:
+            return [row.Book for row in rows], rows[0].facets
+
+        if not cursor:
+            return [], {"authors": {}, "categories": {}, "genres": {}}
+
+        result = await session.execute(select(facet_counts))
+        return [], result.scalar_one()
+
+    def get_export_statement(
+        self,
+        author: Optional[str] = None,
+        category: Optional[str] = None,
+        genre: Optional[str] = None,
+        updated_since: Optional[datetime] = None,
+    ):
+        statement = select(Book).order_by(Book.updated_at, Book.uid)
+        if author:
+            statement = statement.where(self.contains_uid(Book.authors, author))
+        if category:
+            statement = statement.where(self.contains_uid(Book.categories, category))
+        if genre:
+            statement = statement.where(self.contains_uid(Book.genres, genre))
+        if updated_since:
+            statement = statement.where(Book.updated_at >= updated_since)
+
+        return statement
+
+    async def stream_books(self, statement, session: AsyncSession):
+        result = await session.stream_scalars(
+            statement.execution_options(yield_per=BOOK_EXPORT_BATCH_SIZE)
+        )
+        async for book in result:
+            yield book
+
+    async def search_books(
+        self,
+        query: str,
+        session: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[tuple] = None,
+    ):
+        ts_query = func.websearch_to_tsquery("english", query)
+        search_vector = literal_column("books.search_vector")
+        rank = func.ts_rank_cd(search_vector, ts_query).label("rank")
+
+        statement = (
+            select(Book, rank)
+            .where(search_vector.op("@@")(ts_query))
+            .order_by(rank.desc(), Book.uid)
+            .options(*load_fields(Book, fields, "uid"))
+            .limit(limit)
+        )
+        if cursor:
+            last_rank, last_uid = decode_cursor(cursor, float, uuid.UUID)
+            statement = statement.where(
+                or_(rank < last_rank, and_(rank == last_rank, Book.uid > last_uid))
+            )
+
+        result = await session.execute(statement)
+        rows = result.all()
+
+        books = [row.Book for row in rows]
+        next_cursor = (
+            encode_cursor(rows[-1].rank, rows[-1].Book.uid)
+            if len(rows) == limit
+            else None
+        )
+        return books, next_cursor
+
+    async def autocomplete(self, query: str, limit: int, session: AsyncSession):
+        full_name = (
+            Author.first_name + literal_column("' '") + Author.last_name
+        ).self_group()
+
+        book_score = func.word_similarity(query, Book.title)
+        books = (
+            select(
+                literal("book").label("type"),
+                Book.uid.label("uid"),
+                Book.title.label("label"),
+                book_score.label("score"),
+            )
+            .where(literal(query).op("<%")(Book.title))
+            .order_by(book_score.desc())
+            .limit(limit)
+        )
+
+        pen_name_score = func.word_similarity(query, Author.pen_name)
+        full_name_score = func.word_similarity(query, full_name)
+        author_score = func.greatest(pen_name_score, full_name_score)
+        authors = (
+            select(
+                literal("author").label("type"),
+                Author.uid.label("uid"),
+                func.coalesce(Author.pen_name, full_name).label("label"),
+                author_score.label("score"),
+            )
+            .where(
+                or_(
+                    literal(query).op("<%")(Author.pen_name),
+                    literal(query).op("<%")(full_name),
+                )
+            )
+            .order_by(author_score.desc())
+            .limit(limit)
+        )
+
+        suggestions = union_all(books, authors).subquery()
+        result = await session.execute(
+            select(suggestions).order_by(suggestions.c.score.desc()).limit(limit)
+        )
+        return result.all()
+
+    async def update_book_image_variants(
+        self, book_uid: str, image_url: str, image_variants: dict, session: AsyncSession
+    ):
+        await session.execute(
+            update(Book)
+            .where(Book.uid == book_uid)
+            .values(
+                image_variants=Book.image_variants.op("||")(
+                    cast({image_url: image_variants}, pg.JSONB)
+                )
+            )
+        )
+        await session.commit()
+        await response_cache.invalidate(f"book:{book_uid}")
+
     async def update_book_image(
         self, book: Book, image_url: str, session: AsyncSession
     ):
-        book.images.append(image_url)
+        book.images = [*book.images, image_url]
         await session.commit()
         await session.refresh(book)
+        await response_cache.invalidate(f"book:{book.uid}")
         return book
+
+
+class BookImportService:
+    async def create_book_import(
+        self, user_uid: str, object_name: str, format: str, session: AsyncSession
+    ):
+        book_import = BookImport(
+            user_uid=user_uid, object_name=object_name, format=format
+        )
+        session.add(book_import)
+        await session.commit()
+        await session.refresh(book_import)
+
+        return book_import
+
+    async def get_book_import(
+        self, book_import_uid: str, user_uid: str, session: AsyncSession
+    ):
+        book_import = await session.get(
+            BookImport, book_import_uid, populate_existing=True
+        )
+        if book_import is None or str(book_import.user_uid) != user_uid:
+            return None
+
+        return book_import
+
+    async def update_book_import(
+        self,
+        book_import_uid: str,
+        status: str,
+        session: AsyncSession,
+        progress: Optional[dict] = None,
+        error: Optional[str] = None,
+    ):
+        book_import = await session.get(BookImport, book_import_uid)
+        if book_import is None:
+            return None
+
+        book_import.status = status
+        book_import.error = error
+        for field, value in (progress or {}).items():
+            setattr(book_import, field, value)
+
+        await session.commit()
+        await session.refresh(book_import)
+
+        return book_import
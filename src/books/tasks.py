@@ -0,0 +1,154 @@
+import asyncio
+import os
+from collections import defaultdict
+from typing import Optional
+
+import celery
+
+from pkg.db import async_session_maker, engine, get_session
+from pkg.images import parse_variant_name, render_image_variants
+from pkg.redis import redis_client
+from pkg.storage import (
+    IMMUTABLE_CACHE_CONTROL,
+    get_object_bytes,
+    get_object_url,
+    iter_object_lines,
+    list_object_names,
+    put_object_bytes,
+    remove_object,
+)
+from src.books.importer import BookImporter, read_book_import_rows
+from src.books.service import BookImportService, BookService
+from src.uploads.service import UploadJobService
+
+
+def store_book_image_variants(object_name: str) -> dict:
+    variant_prefix = os.path.splitext(object_name)[0]
+    thumbnail_url = None
+    srcsets = defaultdict(list)
+
+    # Stored images are content-addressed, so variants rendered for another
+    # book that shares the same original are reused as-is.
+    variants = [
+        (variant_name, *parse_variant_name(os.path.basename(variant_name)))
+        for variant_name in list_object_names(f"{variant_prefix}/")
+    ]
+
+    if not variants:
+        for variant in render_image_variants(get_object_bytes(object_name)):
+            variant_name = f"{variant_prefix}/{variant.name}"
+            put_object_bytes(
+                variant_name,
+                variant.data,
+                variant.content_type,
+                IMMUTABLE_CACHE_CONTROL,
+            )
+            variants.append((variant_name, variant.content_type, variant.width))
+
+    for variant_name, content_type, width in sorted(
+        variants, key=lambda variant: (variant[1], variant[2] or 0)
+    ):
+        variant_url = get_object_url(variant_name)
+        if width is None:
+            thumbnail_url = variant_url
+        else:
+            srcsets[content_type].append(f"{variant_url} {width}w")
+
+    return {
+        "thumbnail": thumbnail_url,
+        "sources": [
+            {"type": content_type, "srcset": ", ".join(srcset)}
+            for content_type, srcset in srcsets.items()
+        ],
+    }
+
+
+@celery.shared_task
+def generate_book_image_variants_task(
+    book_uid: str, object_name: str, upload_job_uid: Optional[str] = None
+):
+    failure = None
+    try:
+        image_variants = store_book_image_variants(object_name)
+    except Exception as e:
+        failure = e
+
+    async def async_update_book_image_variants():
+        nonlocal failure
+
+        try:
+            async for session in get_session():
+                if failure is None:
+                    try:
+                        book_service = BookService()
+                        await book_service.update_book_image_variants(
+                            book_uid,
+                            get_object_url(object_name),
+                            image_variants,
+                            session,
+                        )
+                    except Exception as e:
+                        await session.rollback()
+                        failure = e
+
+                if upload_job_uid:
+                    upload_job_service = UploadJobService()
+                    await upload_job_service.update_upload_job_status(
+                        upload_job_uid,
+                        "processed" if failure is None else "failed",
+                        session,
+                        error=None if failure is None else "Image processing failed",
+                    )
+        finally:
+            await engine.dispose()
+            await redis_client.connection_pool.disconnect()
+
+    asyncio.run(async_update_book_image_variants())
+
+    if failure is not None:
+        raise failure
+
+
+@celery.shared_task
+def import_books_task(book_import_uid: str):
+    async def async_import_books():
+        try:
+            async with async_session_maker() as session:
+                book_import_service = BookImportService()
+                book_import = await book_import_service.update_book_import(
+                    book_import_uid, "processing", session
+                )
+                if book_import is None:
+                    return
+
+                object_name = book_import.object_name
+                rows = read_book_import_rows(
+                    iter_object_lines(object_name), book_import.format
+                )
+
+                async def save_progress(progress: dict) -> None:
+                    await book_import_service.update_book_import(
+                        book_import_uid, "processing", session, progress
+                    )
+
+                try:
+                    progress = await BookImporter().import_books(
+                        rows, session, save_progress
+                    )
+                except Exception as e:
+                    print(f"Error importing books: {e}")
+                    await session.rollback()
+                    await book_import_service.update_book_import(
+                        book_import_uid, "failed", session, error="Book import failed"
+                    )
+                    return
+
+                await book_import_service.update_book_import(
+                    book_import_uid, "completed", session, progress
+                )
+                await remove_object(object_name)
+        finally:
+            await engine.dispose()
+            await redis_client.connection_pool.disconnect()
+
+    asyncio.run(async_import_books())
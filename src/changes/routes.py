@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, Request, status
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pkg.db import get_session
+from pkg.projection import parse_page_size
+from pkg.responses import JSONResponse
+from src.authors.schemas import AuthorResponseSchema
+from src.books.schemas import BookExportSchema
+
+from .service import (
+    CHANGE_MAX_PAGE_SIZE,
+    CHANGE_PAGE_SIZE,
+    CHANGE_TYPES,
+    ChangeService,
+)
+
+change_router = APIRouter()
+
+change_service = ChangeService()
+
+change_schemas = {"author": AuthorResponseSchema, "book": BookExportSchema}
+
+
+@change_router.get("", status_code=status.HTTP_200_OK)
+async def list_changes(request: Request, session: AsyncSession = Depends(get_session)):
+    cursor = request.query_params.get("cursor")
+    limit = parse_page_size(
+        request.query_params.get("limit"), CHANGE_PAGE_SIZE, CHANGE_MAX_PAGE_SIZE
+    )
+    change_types = sorted(
+        set(request.query_params.get("types", ",".join(CHANGE_TYPES)).split(","))
+    )
+
+    if not change_types or any(
+        change_type not in CHANGE_TYPES for change_type in change_types
+    ):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid change types"},
+        )
+
+    try:
+        changes, next_cursor, has_more = await change_service.list_changes(
+            change_types, cursor, limit, session
+        )
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "List of changes",
+            "changes": [
+                {
+                    "type": change_type,
+                    "uid": entity.uid,
+                    "updated_at": entity.updated_at,
+                    change_type: change_schemas[change_type].model_validate(entity),
+                }
+                for change_type, entity in changes
+            ],
+            "next_cursor": next_cursor or cursor,
+            "has_more": has_more,
+        },
+    )
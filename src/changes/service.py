@@ -0,0 +1,103 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import literal, select, tuple_, union_all
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pkg.pagination import decode_cursor, encode_cursor
+from src.authors.models import Author
+from src.authors.service import AuthorService
+from src.books.models import Book
+from src.books.service import BookService
+
+CHANGE_TYPES = {"author": Author, "book": Book}
+CHANGE_PAGE_SIZE = 100
+CHANGE_MAX_PAGE_SIZE = 1000
+
+# updated_at is stamped when a row is flushed, not when its transaction
+# commits, so the newest rows are held back until slower writers settle.
+CHANGE_SETTLE_DELAY = timedelta(seconds=5)
+
+
+class ChangeService:
+    def __init__(self):
+        self.author_service = AuthorService()
+        self.book_service = BookService()
+
+    def changes_after(
+        self, change_type: str, model, cursor: Optional[tuple], limit: int
+    ):
+        statement = select(
+            literal(change_type).label("type"),
+            model.uid.label("uid"),
+            model.updated_at.label("updated_at"),
+        ).where(model.updated_at < datetime.now() - CHANGE_SETTLE_DELAY)
+
+        if cursor is not None:
+            updated_at, cursor_type, uid = cursor
+            if change_type > cursor_type:
+                statement = statement.where(model.updated_at >= updated_at)
+            elif change_type == cursor_type:
+                statement = statement.where(
+                    tuple_(model.updated_at, model.uid) > tuple_(updated_at, uid)
+                )
+            else:
+                statement = statement.where(model.updated_at > updated_at)
+
+        return statement.order_by(model.updated_at, model.uid).limit(limit)
+
+    async def list_changes(
+        self,
+        change_types: list[str],
+        cursor: Optional[str],
+        limit: int,
+        session: AsyncSession,
+    ):
+        if cursor:
+            cursor = decode_cursor(cursor, datetime.fromisoformat, str, uuid.UUID)
+
+        changes = union_all(
+            *(
+                self.changes_after(
+                    change_type, CHANGE_TYPES[change_type], cursor, limit
+                )
+                .subquery()
+                .select()
+                for change_type in change_types
+            )
+        ).subquery()
+        result = await session.execute(
+            select(changes)
+            .order_by(changes.c.updated_at, changes.c.type, changes.c.uid)
+            .limit(limit)
+        )
+        rows = result.all()
+
+        uids = {change_type: [] for change_type in change_types}
+        for row in rows:
+            uids[row.type].append(row.uid)
+
+        entities = {}
+        if uids.get("author"):
+            for author in await self.author_service.get_authors_by_uids(
+                uids["author"], session
+            ):
+                entities["author", author.uid] = author
+        if uids.get("book"):
+            for book in await self.book_service.get_books_by_uids(
+                uids["book"], session
+            ):
+                entities["book", book.uid] = book
+
+        changes = [
+            (row.type, entities[row.type, row.uid])
+            for row in rows
+            if (row.type, row.uid) in entities
+        ]
+        next_cursor = (
+            encode_cursor(rows[-1].updated_at, rows[-1].type, rows[-1].uid)
+            if rows
+            else None
+        )
+        return changes, next_cursor, len(rows) == limit
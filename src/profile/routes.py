@@ -1,15 +1,13 @@
-import json
-import os
-
 from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from pkg.config import Config
 from pkg.db import get_session
-from pkg.tasks import upload_image_task
+from pkg.etag import etag_matches, make_etag, not_modified_response
+from pkg.responses import JSONResponse
+from pkg.storage import get_object_url
 from pkg.utils import get_current_user_uid
 from src.auth.service import UserService
+from src.uploads.service import StoredImageService
 
 from .schemas import UserProfileResponseSchema, UserProfileUpdateSchema
 from .service import UserProfileService
@@ -18,6 +16,46 @@ profile_router = APIRouter()
 
 user_service = UserService()
 user_profile_service = UserProfileService()
+stored_image_service = StoredImageService()
+
+
+@profile_router.get("/me", status_code=status.HTTP_200_OK)
+async def get_user_profile(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    user_uid: str = Depends(get_current_user_uid),
+):
+    if request.headers.get("if-none-match"):
+        user_profile_version = (
+            await user_profile_service.get_user_profile_version_by_user_uid(
+                user_uid, session
+            )
+        )
+        if user_profile_version:
+            etag = make_etag(*user_profile_version)
+            if etag_matches(request, etag):
+                return not_modified_response(etag)
+
+    user_profile = await user_profile_service.get_user_profile_by_user_uid(
+        user_uid, session
+    )
+
+    if not user_profile:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "User profile not found"},
+        )
+
+    etag = make_etag(user_profile.uid, user_profile.updated_at)
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "User profile found",
+            "user_profile": UserProfileResponseSchema.model_validate(user_profile),
+        },
+        headers={"ETag": etag},
+    )
 
 
 @profile_router.patch("/update-profile", status_code=status.HTTP_200_OK)
@@ -37,9 +75,7 @@ async def update_user_profile(
         status_code=status.HTTP_200_OK,
         content={
             "message": "User profile updated successfully",
-            "user_profile": UserProfileResponseSchema(
-                **json.loads(user_profile.model_dump_json())
-            ).model_dump(),
+            "user_profile": UserProfileResponseSchema.model_validate(user_profile),
         },
     )
 
@@ -63,17 +99,12 @@ async def update_user_avatar(
             content={"message": "Avatar image is required"},
         )
 
-    avatar_image_content = await avatar_image.read()
-    avatar_image_file_extension = os.path.splitext(avatar_image.filename)[1]
-    avatar_image_file_name = f"user_avatars/{user_uid}{avatar_image_file_extension}"
-
-    upload_image_task.delay(
-        avatar_image_content,
-        avatar_image_file_name,
-        avatar_image.content_type,
+    avatar_image_file_name = await stored_image_service.store_image(
+        avatar_image.file, avatar_image.filename, avatar_image.content_type, session
     )
+    await stored_image_service.release_image(user_profile.avatar, session)
 
-    file_url = f"http://{Config.DOMAIN}/minio/storage/{Config.MINIO_STORAGE_BUCKET}/{avatar_image_file_name}"
+    file_url = get_object_url(avatar_image_file_name)
     await user_profile_service.update_user_profile_avatar(
         user_profile, file_url, session
     )
@@ -82,8 +113,6 @@ async def update_user_avatar(
         status_code=status.HTTP_200_OK,
         content={
             "message": "User avatar updated successfully",
-            "user_profile": UserProfileResponseSchema(
-                **json.loads(user_profile.model_dump_json())
-            ).model_dump(),
+            "user_profile": UserProfileResponseSchema.model_validate(user_profile),
         },
     )
@@ -1,3 +1,6 @@
+import uuid
+from datetime import datetime
+
 from pydantic import BaseModel, Field
 
 
@@ -17,14 +20,15 @@ class UserProfileUpdateSchema(BaseModel):
 
 
 class UserProfileResponseSchema(BaseModel):
-    uid: str
-    user_uid: str
+    uid: uuid.UUID
+    user_uid: uuid.UUID
     bio: str
     avatar: str
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
 
     model_config = {
+        "from_attributes": True,
         "json_schema_extra": {
             "example": {
                 "uid": "123e4567-e89b-12d3-a456-426614174000",
@@ -34,5 +38,5 @@ class UserProfileResponseSchema(BaseModel):
                 "created_at": "2024-10-08T09:22:21.361119",
                 "updated_at": "2024-10-08T09:22:21.361119",
             }
-        }
+        },
     }
@@ -25,6 +25,16 @@ class UserProfileService:
         user_profile = result.scalars().first()
         return user_profile
 
+    async def get_user_profile_version_by_user_uid(
+        self, user_uid: str, session: AsyncSession
+    ):
+        result = await session.execute(
+            select(UserProfile.uid, UserProfile.updated_at).where(
+                UserProfile.user_uid == user_uid
+            )
+        )
+        return result.first()
+
     async def update_user_profile_avatar(
         self, user_profile: UserProfile, user_avatar_url: str, session: AsyncSession
     ):
@@ -0,0 +1,35 @@
+import asyncio
+import json
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+from pkg.pubsub import pubsub
+
+UPLOAD_JOB_CHANNEL = "upload_jobs"
+
+
+class UploadJobEvents:
+    def __init__(self):
+        self.queues: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def dispatch(self, message: str) -> None:
+        event = json.loads(message)
+        for queue in self.queues.get(event["uid"], ()):
+            queue.put_nowait(event)
+
+    @contextmanager
+    def listen(self, job_uid: str) -> Iterator[asyncio.Queue]:
+        queue = asyncio.Queue()
+        self.queues[job_uid].add(queue)
+        try:
+            yield queue
+        finally:
+            self.queues[job_uid].discard(queue)
+            if not self.queues[job_uid]:
+                del self.queues[job_uid]
+
+
+upload_job_events = UploadJobEvents()
+
+pubsub.subscribe(UPLOAD_JOB_CHANNEL, upload_job_events.dispatch)
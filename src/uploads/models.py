@@ -0,0 +1,47 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+import sqlalchemy.dialects.postgresql as pg
+from sqlmodel import Column, Field, SQLModel
+
+
+class StoredImage(SQLModel, table=True):
+    __tablename__ = "stored_images"
+
+    digest: str = Field(sa_column=Column(pg.VARCHAR(64), primary_key=True))
+    object_name: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, unique=True))
+    content_type: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
+    size: int = Field(sa_column=Column(pg.BIGINT, nullable=False))
+    ref_count: int = Field(sa_column=Column(pg.INTEGER, nullable=False, default=1))
+    created_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.now)
+    )
+
+    def __repr__(self):
+        return f"<StoredImage {self.object_name}>"
+
+
+class UploadJob(SQLModel, table=True):
+    __tablename__ = "upload_jobs"
+
+    uid: uuid.UUID = Field(
+        sa_column=Column(pg.UUID, nullable=False, primary_key=True, default=uuid.uuid4)
+    )
+    user_uid: uuid.UUID = Field(sa_column=Column(pg.UUID, nullable=False))
+    target: str = Field(sa_column=Column(pg.VARCHAR, nullable=False))
+    target_uid: uuid.UUID = Field(sa_column=Column(pg.UUID, nullable=False))
+    object_name: Optional[str] = Field(sa_column=Column(pg.VARCHAR, nullable=True))
+    status: str = Field(sa_column=Column(pg.VARCHAR, nullable=False, default="queued"))
+    error: Optional[str] = Field(sa_column=Column(pg.TEXT, nullable=True))
+    created_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP, nullable=False, default=datetime.now)
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            pg.TIMESTAMP, nullable=False, default=datetime.now, onupdate=datetime.now
+        )
+    )
+
+    def __repr__(self):
+        return f"<UploadJob {self.uid} {self.status}>"
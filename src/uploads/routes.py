@@ -0,0 +1,228 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pkg.db import get_session
+from pkg.responses import JSONResponse
+from pkg.storage import IMAGE_CONTENT_TYPES
+from pkg.utils import get_current_user_uid
+from src.authors.service import AuthorService
+from src.books.service import BookService
+
+from .events import upload_job_events
+from .schemas import (
+    UploadConfirmSchema,
+    UploadJobResponseSchema,
+    UploadPresignResponseSchema,
+    UploadPresignSchema,
+)
+from .service import UPLOAD_JOB_FINAL_STATUSES, UploadJobService, UploadService
+from .tasks import store_uploaded_image_task
+
+upload_router = APIRouter()
+
+author_service = AuthorService()
+book_service = BookService()
+upload_job_service = UploadJobService()
+upload_service = UploadService()
+
+UPLOAD_JOB_EVENT_KEEPALIVE_SECONDS = 15
+
+
+@upload_router.post("/presign", status_code=status.HTTP_201_CREATED)
+async def presign_upload(
+    upload_data: UploadPresignSchema,
+    session: AsyncSession = Depends(get_session),
+    user_uid: str = Depends(get_current_user_uid),
+):
+    if upload_data.content_type not in IMAGE_CONTENT_TYPES:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Unsupported image content type"},
+        )
+
+    target_uid = upload_data.target_uid
+
+    if upload_data.target == "user_avatar":
+        target_uid = user_uid
+    elif not target_uid:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Target uid is required"},
+        )
+    elif upload_data.target == "book_image":
+        book = await book_service.get_book_by_uid(target_uid, session)
+        if not book:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"message": "Book not found"},
+            )
+
+        if len(book.images) >= 5:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={"message": "Book image limit reached"},
+            )
+    elif upload_data.target == "author_profile_image":
+        author = await author_service.get_author_by_uid(target_uid, session)
+        if not author:
+            return JSONResponse(
+                status_code=status.HTTP_404_NOT_FOUND,
+                content={"message": "Author not found"},
+            )
+
+    upload_job = await upload_job_service.create_upload_job(
+        user_uid, upload_data.target, target_uid, session
+    )
+    upload = upload_service.create_presigned_upload(
+        user_uid,
+        upload_data.target,
+        target_uid,
+        upload_data.content_type,
+        str(upload_job.uid),
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_201_CREATED,
+        content={
+            "message": "Upload URL created successfully",
+            "upload": UploadPresignResponseSchema(**upload),
+        },
+    )
+
+
+async def fail_upload_job(
+    upload_job_uid: str, message: str, status_code: int, session: AsyncSession
+):
+    await session.rollback()
+    await upload_job_service.update_upload_job_status(
+        upload_job_uid, "failed", session, error=message
+    )
+
+    return JSONResponse(status_code=status_code, content={"message": message})
+
+
+@upload_router.post("/confirm", status_code=status.HTTP_202_ACCEPTED)
+async def confirm_upload(
+    confirm_data: UploadConfirmSchema,
+    session: AsyncSession = Depends(get_session),
+    user_uid: str = Depends(get_current_user_uid),
+):
+    upload = upload_service.get_upload(confirm_data.upload_token, user_uid)
+    if not upload:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid upload token"},
+        )
+
+    upload_job_uid = upload["upload_job_uid"]
+    upload_job = await upload_job_service.claim_upload_job(
+        upload_job_uid, user_uid, upload["object_name"], session
+    )
+    if not upload_job:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Upload already confirmed"},
+        )
+
+    error = await upload_service.verify_uploaded_object(upload)
+    if error:
+        return await fail_upload_job(
+            upload_job_uid, error, status.HTTP_400_BAD_REQUEST, session
+        )
+
+    # Hashing and attaching the image reads the whole object, so it runs in a
+    # worker and the API only checks the object's metadata.
+    store_uploaded_image_task.delay(upload)
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "message": "Upload confirmed successfully",
+            "upload_job": UploadJobResponseSchema.model_validate(upload_job),
+        },
+    )
+
+
+@upload_router.get("/jobs/{job_uid}", status_code=status.HTTP_200_OK)
+async def get_upload_job(
+    job_uid: str,
+    session: AsyncSession = Depends(get_session),
+    user_uid: str = Depends(get_current_user_uid),
+):
+    upload_job = await upload_job_service.get_upload_job(job_uid, user_uid, session)
+    if not upload_job:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Upload job not found"},
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "message": "Upload job retrieved successfully",
+            "upload_job": UploadJobResponseSchema.model_validate(upload_job),
+        },
+    )
+
+
+@upload_router.get("/jobs/{job_uid}/events", status_code=status.HTTP_200_OK)
+async def stream_upload_job_events(
+    job_uid: str,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    user_uid: str = Depends(get_current_user_uid),
+):
+    upload_job = await upload_job_service.get_upload_job(job_uid, user_uid, session)
+    if not upload_job:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Upload job not found"},
+        )
+
+    upload_job_uid = str(upload_job.uid)
+
+    async def load_upload_job_event() -> dict:
+        async for stream_session in get_session():
+            upload_job = await upload_job_service.get_upload_job(
+                upload_job_uid, user_uid, stream_session
+            )
+
+        return UploadJobResponseSchema.model_validate(upload_job).model_dump(
+            mode="json"
+        )
+
+    async def event_stream():
+        # Subscribe before reading the current state so no transition can slip
+        # in between, and re-read on idle timeouts in case a message was lost.
+        with upload_job_events.listen(upload_job_uid) as queue:
+            event, last_event = await load_upload_job_event(), None
+
+            while True:
+                if event != last_event:
+                    yield f"event: upload_job\ndata: {json.dumps(event)}\n\n"
+                    last_event = event
+                else:
+                    yield ": keepalive\n\n"
+
+                if (
+                    event["status"] in UPLOAD_JOB_FINAL_STATUSES
+                    or await request.is_disconnected()
+                ):
+                    break
+
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), UPLOAD_JOB_EVENT_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    event = await load_upload_job_event()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
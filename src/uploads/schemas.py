@@ -0,0 +1,89 @@
+import uuid
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class UploadPresignSchema(BaseModel):
+    target: Literal["book_image", "user_avatar", "author_profile_image"] = Field(
+        description="What the uploaded image will be attached to."
+    )
+    target_uid: Optional[str] = Field(
+        default=None,
+        description="The uid of the book or author. Not needed for user avatars.",
+    )
+    content_type: str = Field(
+        description="The content type the image will be uploaded with."
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "target": "book_image",
+                "target_uid": "123e4567-e89b-12d3-a456-426614174000",
+                "content_type": "image/jpeg",
+            }
+        }
+    }
+
+
+class UploadPresignResponseSchema(BaseModel):
+    upload_url: str
+    upload_token: str
+    object_name: str
+    expires_in: int
+    upload_job_uid: uuid.UUID
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "upload_url": "http://localhost:8080/bookly/uploads/9f86d081884c4b1e8b7d2c5e6f0a1b2c.jpg?X-Amz-Algorithm=AWS4-HMAC-SHA256",
+                "upload_token": "eyJ1c2VyX3VpZCI6IjEyM2U0NTY3In0.ZwV1Aw.signature",
+                "object_name": "uploads/9f86d081884c4b1e8b7d2c5e6f0a1b2c.jpg",
+                "expires_in": 900,
+                "upload_job_uid": "2b1e5a36-3c1d-4a4f-9b0e-7f3c2d1e0a9b",
+            }
+        }
+    }
+
+
+class UploadConfirmSchema(BaseModel):
+    upload_token: str = Field(
+        description="The upload token returned when the upload URL was issued."
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "upload_token": "eyJ1c2VyX3VpZCI6IjEyM2U0NTY3In0.ZwV1Aw.signature",
+            }
+        }
+    }
+
+
+class UploadJobResponseSchema(BaseModel):
+    uid: uuid.UUID
+    target: str
+    target_uid: uuid.UUID
+    object_name: Optional[str]
+    status: Literal["queued", "confirmed", "stored", "processed", "failed"]
+    error: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {
+        "from_attributes": True,
+        "json_schema_extra": {
+            "example": {
+                "uid": "2b1e5a36-3c1d-4a4f-9b0e-7f3c2d1e0a9b",
+                "target": "book_image",
+                "target_uid": "123e4567-e89b-12d3-a456-426614174000",
+                "object_name": "images/2c26b46b68ffc68ff99b453c1d30413413422d706483bfa0f98a5e886266e7ae.jpg",
+                "status": "stored",
+                "error": None,
+                "created_at": "2024-10-16T10:00:00",
+                "updated_at": "2024-10-16T10:00:02",
+            }
+        },
+    }
@@ -0,0 +1,280 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import BinaryIO, Optional
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pkg.config import Config
+from pkg.pubsub import pubsub
+from pkg.storage import (
+    IMAGE_CONTENT_TYPES,
+    IMAGE_MAX_SIZE,
+    IMMUTABLE_CACHE_CONTROL,
+    copy_object,
+    get_object_name,
+    get_presigned_upload_url,
+    hash_fileobj,
+    hash_object,
+    remove_object,
+    remove_objects,
+    stat_object,
+    upload_fileobj,
+)
+from pkg.utils import generate_url_safe_token, get_url_safe_token_data
+
+from .events import UPLOAD_JOB_CHANNEL
+from .models import StoredImage, UploadJob
+from .schemas import UploadJobResponseSchema
+
+UPLOAD_URL_EXPIRY = timedelta(minutes=15)
+UPLOAD_CONFIRM_EXPIRY = timedelta(hours=1)
+# Upload tokens carry a user_uid and expires_at like access tokens, so they are
+# signed with their own salt to keep them from being accepted as one.
+UPLOAD_TOKEN_SALT = f"{Config.JWT_SALT}:upload"
+
+UPLOAD_JOB_FINAL_STATUSES = ("processed", "failed")
+
+STORED_IMAGE_FOLDER = "images"
+PENDING_UPLOAD_FOLDER = "uploads"
+
+
+class UploadService:
+    def create_presigned_upload(
+        self,
+        user_uid: str,
+        target: str,
+        target_uid: str,
+        content_type: str,
+        upload_job_uid: str,
+    ) -> dict:
+        object_name = (
+            f"{PENDING_UPLOAD_FOLDER}/{uuid.uuid4().hex}"
+            f"{IMAGE_CONTENT_TYPES[content_type]}"
+        )
+
+        upload_token = generate_url_safe_token(
+            {
+                "user_uid": user_uid,
+                "target": target,
+                "target_uid": target_uid,
+                "object_name": object_name,
+                "content_type": content_type,
+                "upload_job_uid": upload_job_uid,
+                "expires_at": (datetime.now() + UPLOAD_CONFIRM_EXPIRY).timestamp(),
+            },
+            salt=UPLOAD_TOKEN_SALT,
+        )
+
+        return {
+            "upload_url": get_presigned_upload_url(object_name, UPLOAD_URL_EXPIRY),
+            "upload_token": upload_token,
+            "object_name": object_name,
+            "expires_in": int(UPLOAD_URL_EXPIRY.total_seconds()),
+            "upload_job_uid": upload_job_uid,
+        }
+
+    def get_upload(self, upload_token: str, user_uid: str) -> Optional[dict]:
+        upload = get_url_safe_token_data(upload_token, UPLOAD_TOKEN_SALT)
+
+        if upload.get("user_uid") != user_uid or not upload.get("upload_job_uid"):
+            return None
+
+        if datetime.now().timestamp() > upload.get("expires_at", 0):
+            return None
+
+        return upload
+
+    async def verify_uploaded_object(self, upload: dict) -> Optional[str]:
+        uploaded_object = await stat_object(upload["object_name"])
+
+        if uploaded_object is None:
+            return "Uploaded image not found"
+
+        if uploaded_object.size > IMAGE_MAX_SIZE:
+            await remove_object(upload["object_name"])
+            return "Uploaded image is too large"
+
+        if uploaded_object.content_type != upload["content_type"]:
+            await remove_object(upload["object_name"])
+            return "Uploaded image content type does not match"
+
+        return None
+
+
+class StoredImageService:
+    async def acquire_stored_image(
+        self,
+        digest: str,
+        extension: str,
+        content_type: str,
+        size: int,
+        session: AsyncSession,
+    ):
+        stmt = insert(StoredImage).values(
+            digest=digest,
+            object_name=f"{STORED_IMAGE_FOLDER}/{digest}{extension.lower()}",
+            content_type=content_type,
+            size=size,
+            ref_count=1,
+            created_at=datetime.now(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StoredImage.digest],
+            set_={"ref_count": StoredImage.ref_count + 1},
+        ).returning(StoredImage.object_name, StoredImage.ref_count)
+
+        result = await session.execute(stmt)
+        return result.one()
+
+    async def store_image(
+        self, file: BinaryIO, filename: str, content_type: str, session: AsyncSession
+    ) -> str:
+        digest, size = await hash_fileobj(file)
+        stored_image = await self.acquire_stored_image(
+            digest, os.path.splitext(filename)[1], content_type, size, session
+        )
+
+        if (
+            stored_image.ref_count == 1
+            or await stat_object(stored_image.object_name) is None
+        ):
+            await upload_fileobj(
+                stored_image.object_name, file, content_type, IMMUTABLE_CACHE_CONTROL
+            )
+
+        return stored_image.object_name
+
+    async def store_uploaded_image(
+        self, upload_object_name: str, content_type: str, session: AsyncSession
+    ) -> str:
+        digest, size = await hash_object(upload_object_name)
+        stored_image = await self.acquire_stored_image(
+            digest, IMAGE_CONTENT_TYPES[content_type], content_type, size, session
+        )
+
+        if (
+            stored_image.ref_count == 1
+            or await stat_object(stored_image.object_name) is None
+        ):
+            await copy_object(
+                upload_object_name,
+                stored_image.object_name,
+                content_type,
+                IMMUTABLE_CACHE_CONTROL,
+            )
+
+        await remove_object(upload_object_name)
+
+        return stored_image.object_name
+
+    async def release_image(self, image_url: Optional[str], session: AsyncSession):
+        object_name = get_object_name(image_url)
+        if not object_name or not object_name.startswith(f"{STORED_IMAGE_FOLDER}/"):
+            return
+
+        result = await session.execute(
+            update(StoredImage)
+            .where(StoredImage.object_name == object_name)
+            .values(ref_count=StoredImage.ref_count - 1)
+            .returning(StoredImage.digest, StoredImage.ref_count)
+        )
+        stored_image = result.first()
+
+        if stored_image is None or stored_image.ref_count > 0:
+            return
+
+        # The row lock is held until commit, so a concurrent upload of the same
+        # content waits here and re-uploads the object once it is gone.
+        await session.execute(
+            delete(StoredImage).where(StoredImage.digest == stored_image.digest)
+        )
+        await remove_object(object_name)
+        await remove_objects(f"{os.path.splitext(object_name)[0]}/")
+
+
+class UploadJobService:
+    async def create_upload_job(
+        self,
+        user_uid: str,
+        target: str,
+        target_uid: str,
+        session: AsyncSession,
+        status: str = "queued",
+        object_name: Optional[str] = None,
+    ):
+        upload_job = UploadJob(
+            user_uid=user_uid,
+            target=target,
+            target_uid=target_uid,
+            object_name=object_name,
+            status=status,
+        )
+        session.add(upload_job)
+        await session.commit()
+        await session.refresh(upload_job)
+
+        return upload_job
+
+    async def get_upload_job(self, job_uid: str, user_uid: str, session: AsyncSession):
+        upload_job = await session.get(UploadJob, job_uid, populate_existing=True)
+        if upload_job is None or str(upload_job.user_uid) != user_uid:
+            return None
+
+        return upload_job
+
+    async def update_upload_job_status(
+        self,
+        job_uid: str,
+        status: str,
+        session: AsyncSession,
+        object_name: Optional[str] = None,
+        error: Optional[str] = None,
+    ):
+        upload_job = await session.get(UploadJob, job_uid)
+        if upload_job is None:
+            return None
+
+        upload_job.status = status
+        upload_job.error = error
+        if object_name is not None:
+            upload_job.object_name = object_name
+
+        await session.commit()
+        await session.refresh(upload_job)
+        await self.publish_upload_job(upload_job)
+
+        return upload_job
+
+    async def claim_upload_job(
+        self, job_uid: str, user_uid: str, object_name: str, session: AsyncSession
+    ):
+        # Only one confirm can move a job out of queued, so a replayed or
+        # concurrent confirm never stores the same upload twice.
+        result = await session.execute(
+            update(UploadJob)
+            .where(
+                UploadJob.uid == job_uid,
+                UploadJob.user_uid == user_uid,
+                UploadJob.status == "queued",
+            )
+            .values(
+                status="confirmed", object_name=object_name, updated_at=datetime.now()
+            )
+            .returning(UploadJob)
+        )
+        upload_job = result.scalar_one_or_none()
+        await session.commit()
+
+        if upload_job is not None:
+            await self.publish_upload_job(upload_job)
+
+        return upload_job
+
+    async def publish_upload_job(self, upload_job: UploadJob) -> None:
+        await pubsub.publish(
+            UPLOAD_JOB_CHANNEL,
+            UploadJobResponseSchema.model_validate(upload_job).model_dump_json(),
+        )
@@ -0,0 +1,107 @@
+import asyncio
+from typing import Optional
+
+import celery
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pkg.db import async_session_maker, engine
+from pkg.redis import redis_client
+from pkg.storage import get_object_url, remove_object
+from src.authors.service import AuthorService
+from src.books.service import BookService
+from src.books.tasks import generate_book_image_variants_task
+from src.profile.service import UserProfileService
+
+from .service import StoredImageService, UploadJobService
+
+
+async def attach_uploaded_image(upload: dict, session: AsyncSession) -> Optional[str]:
+    stored_image_service = StoredImageService()
+    upload_job_service = UploadJobService()
+    upload_job_uid = upload["upload_job_uid"]
+
+    if upload["target"] == "book_image":
+        book_service = BookService()
+        book = await book_service.get_book_by_uid(upload["target_uid"], session)
+        if not book:
+            return "Book not found"
+
+        if len(book.images) >= 5:
+            return "Book image limit reached"
+
+        object_name = await stored_image_service.store_uploaded_image(
+            upload["object_name"], upload["content_type"], session
+        )
+
+        file_url = get_object_url(object_name)
+        if file_url in book.images:
+            return "Book image already added"
+
+        await book_service.update_book_image(book, file_url, session)
+        await upload_job_service.update_upload_job_status(
+            upload_job_uid, "stored", session, object_name=object_name
+        )
+        generate_book_image_variants_task.delay(
+            upload["target_uid"], object_name, upload_job_uid
+        )
+        return None
+
+    if upload["target"] == "author_profile_image":
+        author_service = AuthorService()
+        author = await author_service.get_author_by_uid(upload["target_uid"], session)
+        if not author:
+            return "Author not found"
+
+        object_name = await stored_image_service.store_uploaded_image(
+            upload["object_name"], upload["content_type"], session
+        )
+        await stored_image_service.release_image(author.profile_image, session)
+        await author_service.update_author_profile_image(
+            author, get_object_url(object_name), session
+        )
+    else:
+        user_profile_service = UserProfileService()
+        user_profile = await user_profile_service.get_user_profile_by_user_uid(
+            upload["user_uid"], session
+        )
+        if not user_profile:
+            return "User profile not found"
+
+        object_name = await stored_image_service.store_uploaded_image(
+            upload["object_name"], upload["content_type"], session
+        )
+        await stored_image_service.release_image(user_profile.avatar, session)
+        await user_profile_service.update_user_profile_avatar(
+            user_profile, get_object_url(object_name), session
+        )
+
+    await upload_job_service.update_upload_job_status(
+        upload_job_uid, "processed", session, object_name=object_name
+    )
+    return None
+
+
+@celery.shared_task
+def store_uploaded_image_task(upload: dict):
+    async def async_store_uploaded_image():
+        try:
+            async with async_session_maker() as session:
+                try:
+                    error = await attach_uploaded_image(upload, session)
+                except Exception as e:
+                    print(f"Error storing uploaded image: {e}")
+                    error = "Image processing failed"
+
+                if error is None:
+                    return
+
+                await session.rollback()
+                await remove_object(upload["object_name"])
+                await UploadJobService().update_upload_job_status(
+                    upload["upload_job_uid"], "failed", session, error=error
+                )
+        finally:
+            await engine.dispose()
+            await redis_client.connection_pool.disconnect()
+
+    asyncio.run(async_store_uploaded_image())